@@ -40,7 +40,7 @@ def main():
         sprint_name = sprint['name']
 
         # Get issues in this sprint using JiraClient
-        issues = client.get_sprint_issues(sprint_id)
+        issues = client.get_sprint_issues(sprint_id, closed=True)
         
         # Calculate completed points
         completed_points = 0.0
@@ -1,5 +1,6 @@
 """Epic timeline projection based on team capacity and story points."""
 
+from collections import defaultdict
 from datetime import datetime
 from typing import Any
 
@@ -13,15 +14,22 @@ class EpicPlanner:
 
     def get_epic_data(self, board_id: int) -> list[dict[str, Any]]:
         """Get all epics with their story point totals."""
-        epics = self.client.get_epics(board_id)
+        # Skip done epics
+        epics = [epic for epic in self.client.get_epics(board_id) if not epic.get('done', False)]
+
+        # Fetch every epic's issues in batched parent searches, then group them
+        child_issues = self.client.get_child_issues(
+            [epic['key'] for epic in epics],
+            ['status', 'customfield_10016', 'customfield_10026', 'customfield_10031']
+        )
+        issues_by_epic = defaultdict(list)
+        for issue in child_issues:
+            issues_by_epic[issue['fields']['parent']['key']].append(issue)
+
         epic_data = []
 
         for epic in epics:
-            # Skip done epics
-            if epic.get('done', False):
-                continue
-
-            issues = self.client.get_epic_issues(epic['key'])
+            issues = issues_by_epic[epic['key']]
 
             total_points = 0.0
             completed_points = 0.0
@@ -35,6 +35,11 @@ def main():
         email=os.getenv('JIRA_EMAIL'),
         api_token=os.getenv('JIRA_API_TOKEN')
     )
+
+    # Discard cached Jira responses when a fresh fetch is requested
+    if '--no-cache' in sys.argv[1:]:
+        client.clear_cache()
+
     jira_url = os.getenv('JIRA_URL', '').rstrip('/')
 
     # Find all project configurations
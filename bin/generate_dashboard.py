@@ -14,6 +14,7 @@ import io
 
 from jira_client import JiraClient
 from velocity_calculator import VelocityCalculator
+import orjson
 
 
 def get_jira_colour_hex(colour_key):
@@ -195,7 +196,7 @@ def generate_html_dashboard(project_key, velocity_data, velocity_stats, epic_dat
     # Calculate completion date
     from datetime import timedelta
     if velocity_data:
-        last_sprint_end = datetime.fromisoformat(velocity_data[-1]['end_date'].replace('Z', '+00:00'))
+        last_sprint_end = velocity_data[-1]['end_date_dt']
         projected_completion = last_sprint_end + timedelta(weeks=weeks_remaining)
         completion_date_str = projected_completion.strftime('%Y-%m-%d')
     else:
@@ -619,40 +620,36 @@ def generate_project_dashboard(client, project_key, board_id, team_size, jira_ur
 
     # Fetch epic data
     print("Fetching epic data...")
-    import requests
 
-    url = os.getenv('JIRA_URL').rstrip('/')
-    auth = (os.getenv('JIRA_EMAIL'), os.getenv('JIRA_API_TOKEN'))
-    headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+    # Requests go through the client's pooled session, which carries auth
+    url = client.url
+    headers = {'Content-Type': 'application/json'}
 
     # Fetch epics from board API (has colour info)
-    board_epic_response = requests.get(
+    board_epic_response = client.session.get(
         f'{url}/rest/agile/1.0/board/{board_id}/epic',
-        auth=auth,
-        headers={'Accept': 'application/json'},
         params={'maxResults': 200}
     )
 
-    board_epics = board_epic_response.json().get('values', []) if board_epic_response.status_code == 200 else []
+    board_epics = orjson.loads(board_epic_response.content).get('values', []) if board_epic_response.status_code == 200 else []
     board_epic_keys = {e['key'] for e in board_epics}
 
     # Fetch all project epics via JQL to catch any not on board
-    jql_response = requests.post(
+    jql_response = client.session.post(
         f'{url}/rest/api/3/search/jql',
-        auth=auth,
         headers=headers,
-        json={
+        data=orjson.dumps({
             'jql': f'project = {project_key.upper()} AND type = Epic',
             'maxResults': 200,
             'fields': ['summary', 'status']
-        }
+        })
     )
 
     # Combine: board epics have colour, JQL epics fill gaps
     epics = list(board_epics)  # Start with board epics (have colours)
 
     if jql_response.status_code == 200:
-        jql_epics = jql_response.json().get('issues', [])
+        jql_epics = orjson.loads(jql_response.content).get('issues', [])
         # Add epics from JQL that aren't in board (won't have colour)
         for issue in jql_epics:
             if issue['key'] not in board_epic_keys:
@@ -680,30 +677,27 @@ def generate_project_dashboard(client, project_key, board_id, team_size, jira_ur
         epic_name = epic.get('summary', epic.get('name', 'Unnamed'))
         epic_colour = epic.get('color', {}).get('key', 'color_4')
 
-        issue_response = requests.post(
+        issue_response = client.session.post(
             f'{url}/rest/api/3/search/jql',
-            auth=auth,
             headers=headers,
-            json={
+            data=orjson.dumps({
                 'jql': f'parent = {epic_key}',
                 'maxResults': 200,
                 'fields': ['summary', 'status', 'customfield_10016', 'customfield_10026', 'customfield_10031']
-            }
+            })
         )
 
         if issue_response.status_code != 200:
             continue
 
-        issues = issue_response.json().get('issues', [])
+        issues = orjson.loads(issue_response.content).get('issues', [])
 
         total_points = 0.0
         completed_points = 0.0
         child_tasks = []
 
         for issue in issues:
-            # Try all common story point fields
-            points = issue['fields'].get('customfield_10016') or issue['fields'].get('customfield_10026') or issue['fields'].get('customfield_10031')
-            points = float(points) if points else 0.0
+            points = client.get_story_points(issue)
             total_points += points
 
             status = issue['fields'].get('status', {}).get('name', '').lower()
@@ -738,19 +732,18 @@ def generate_project_dashboard(client, project_key, board_id, team_size, jira_ur
 
     # Fetch stories without epics (no parent)
     print("Fetching stories without epics...")
-    no_epic_response = requests.post(
+    no_epic_response = client.session.post(
         f'{url}/rest/api/3/search/jql',
-        auth=auth,
         headers=headers,
-        json={
+        data=orjson.dumps({
             'jql': f'project = {project_key.upper()} AND parent is EMPTY AND type != Epic',
             'maxResults': 200,
             'fields': ['summary', 'status', 'customfield_10016', 'customfield_10026', 'customfield_10031']
-        }
+        })
     )
 
     if no_epic_response.status_code == 200:
-        no_epic_issues = no_epic_response.json().get('issues', [])
+        no_epic_issues = orjson.loads(no_epic_response.content).get('issues', [])
 
         if no_epic_issues:
             total_points = 0.0
@@ -758,9 +751,7 @@ def generate_project_dashboard(client, project_key, board_id, team_size, jira_ur
             child_tasks = []
 
             for issue in no_epic_issues:
-                # Try all common story point fields
-                points = issue['fields'].get('customfield_10016') or issue['fields'].get('customfield_10026') or issue['fields'].get('customfield_10031')
-                points = float(points) if points else 0.0
+                points = client.get_story_points(issue)
                 total_points += points
 
                 status = issue['fields'].get('status', {}).get('name', '').lower()
@@ -801,7 +792,7 @@ def generate_project_dashboard(client, project_key, board_id, team_size, jira_ur
     # Calculate parallel completion dates using same logic as Gantt chart
     from datetime import datetime, timedelta
     if velocity_data:
-        last_sprint_end = datetime.fromisoformat(velocity_data[-1]['end_date'].replace('Z', '+00:00'))
+        last_sprint_end = velocity_data[-1]['end_date_dt']
     else:
         last_sprint_end = datetime.now()
 
@@ -875,6 +866,11 @@ def main():
         email=os.getenv('JIRA_EMAIL'),
         api_token=os.getenv('JIRA_API_TOKEN')
     )
+
+    # Discard cached Jira responses when a fresh fetch is requested
+    if '--no-cache' in sys.argv[1:]:
+        client.clear_cache()
+
     jira_url = os.getenv('JIRA_URL', '').rstrip('/')
 
     # Find all project configurations
@@ -10,7 +10,7 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.patches import Rectangle
-import requests
+import orjson
 
 from jira_client import JiraClient
 from velocity_calculator import VelocityCalculator
@@ -202,38 +202,35 @@ def generate_project_gantt(client, project_key, board_id, team_size, target_velo
 
     # Get epic data
     print("Fetching epic data...")
-    url = os.getenv('JIRA_URL').rstrip('/')
-    auth = (os.getenv('JIRA_EMAIL'), os.getenv('JIRA_API_TOKEN'))
-    headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+    # Requests go through the client's pooled session, which carries auth
+    url = client.url
+    headers = {'Content-Type': 'application/json'}
 
     # Fetch epics from board API (has colour info)
-    board_epic_response = requests.get(
+    board_epic_response = client.session.get(
         f'{url}/rest/agile/1.0/board/{board_id}/epic',
-        auth=auth,
-        headers={'Accept': 'application/json'},
         params={'maxResults': 200}
     )
 
-    board_epics = board_epic_response.json().get('values', []) if board_epic_response.status_code == 200 else []
+    board_epics = orjson.loads(board_epic_response.content).get('values', []) if board_epic_response.status_code == 200 else []
     board_epic_keys = {e['key'] for e in board_epics}
 
     # Fetch all project epics via JQL to catch any not on board
-    jql_response = requests.post(
+    jql_response = client.session.post(
         f'{url}/rest/api/3/search/jql',
-        auth=auth,
         headers=headers,
-        json={
+        data=orjson.dumps({
             'jql': f'project = {project_key.upper()} AND type = Epic',
             'maxResults': 200,
             'fields': ['summary', 'status']
-        }
+        })
     )
 
     # Combine: board epics have colour, JQL epics fill gaps
     epics = list(board_epics)  # Start with board epics (have colours)
 
     if jql_response.status_code == 200:
-        jql_epics = jql_response.json().get('issues', [])
+        jql_epics = orjson.loads(jql_response.content).get('issues', [])
         # Add epics from JQL that aren't in board (won't have colour)
         for issue in jql_epics:
             if issue['key'] not in board_epic_keys:
@@ -259,27 +256,24 @@ def generate_project_gantt(client, project_key, board_id, team_size, target_velo
         epic_name = epic.get('summary', epic.get('name', 'Unnamed'))
         epic_colour = epic.get('color', {}).get('key', 'color_4')
 
-        issue_response = requests.post(
+        issue_response = client.session.post(
             f'{url}/rest/api/3/search/jql',
-            auth=auth,
             headers=headers,
-            json={
+            data=orjson.dumps({
                 'jql': f'parent = {epic_key}',
                 'maxResults': 200,
                 'fields': ['customfield_10016', 'customfield_10026', 'customfield_10031', 'status']
-            }
+            })
         )
 
         if issue_response.status_code != 200:
             continue
 
-        issues = issue_response.json().get('issues', [])
+        issues = orjson.loads(issue_response.content).get('issues', [])
 
         remaining_points = 0.0
         for issue in issues:
-            # Try all common story point fields
-            points = issue['fields'].get('customfield_10016') or issue['fields'].get('customfield_10026') or issue['fields'].get('customfield_10031')
-            points = float(points) if points else 0.0
+            points = client.get_story_points(issue)
 
             status = issue['fields'].get('status', {}).get('name', '').lower()
             if status not in ['done', 'closed', 'resolved']:
@@ -301,7 +295,7 @@ def generate_project_gantt(client, project_key, board_id, team_size, target_velo
     # Calculate timeline - lay epics out in parallel swim lanes based on team size
     # Each person works on one epic at a time, so team_size = number of parallel tracks
     if velocity_data:
-        last_sprint_end = datetime.fromisoformat(velocity_data[-1]['end_date'].replace('Z', '+00:00'))
+        last_sprint_end = velocity_data[-1]['end_date_dt']
     else:
         last_sprint_end = datetime.now()
 
@@ -410,6 +404,10 @@ def main():
         api_token=os.getenv('JIRA_API_TOKEN')
     )
 
+    # Discard cached Jira responses when a fresh fetch is requested
+    if '--no-cache' in sys.argv[1:]:
+        client.clear_cache()
+
     # Find all project configurations
     projects = []
 
@@ -4,25 +4,38 @@
 import os
 import sys
 import io
-import base64
+import hashlib
 import math
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
 from dotenv import load_dotenv
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.units import mm, inch
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak, PageTemplate, Frame, NextPageTemplate
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.pdfgen import canvas
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from PIL import Image as PILImage
+# matplotlib and reportlab are imported inside the rendering functions so
+# configuration errors in main() are reported without paying their import cost
 
 from jira_client import JiraClient
 from velocity_calculator import VelocityCalculator
-import requests
+import orjson
+
+# Fields and JQL templates for the report's Jira searches
+EPIC_FIELDS = ('summary', 'status', 'customfield_10021', 'priority')  # customfield_10021 is Flagged
+EPIC_CHILD_FIELDS = ('customfield_10016', 'customfield_10026', 'customfield_10031', 'status')
+OPEN_EPICS_JQL = 'project = {project} AND type = Epic AND statusCategory != Done'
+EPIC_CHILDREN_JQL = 'parent = {key}'
+
+# Jira priority names mapped to 1 (highest) to 5 (lowest)
+PRIORITY_NUMBERS = {
+    'Highest': 1,
+    'Critical': 1,
+    'High': 2,
+    'Major': 2,
+    'Medium': 3,
+    'Normal': 3,
+    'Low': 4,
+    'Minor': 4,
+    'Lowest': 5,
+    'Trivial': 5
+}
 
 
 def create_velocity_chart(velocity_data, velocity_stats, actual_velocity=None):
@@ -36,6 +49,10 @@ def create_velocity_chart(velocity_data, velocity_stats, actual_velocity=None):
     if not velocity_data:
         return None
 
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(10, 4))
 
     sprint_names = [s['sprint_name'] for s in velocity_data]
@@ -76,6 +93,8 @@ def create_velocity_chart(velocity_data, velocity_stats, actual_velocity=None):
 
 def get_jira_colour_hex(colour_key):
     """Map Jira colour keys to actual Jira hex values."""
+    from reportlab.lib import colors
+
     # Actual Jira epic colours from https://gist.github.com/jusuchin85/efa658429befb73916b40b1e1a773762
     colour_map = {
         'color_1': '#8d542e',   # Brown
@@ -96,29 +115,63 @@ def get_jira_colour_hex(colour_key):
     return colors.HexColor(colour_map.get(colour_key, colour_map['color_4']))
 
 
-def create_header_footer(canvas_obj, doc):
-    """Add header and footer to each page."""
-    canvas_obj.saveState()
+def create_header_footer(generated_str):
+    """Build the page callback that adds header and footer to each page.
 
-    # Footer
-    canvas_obj.setFont('Helvetica', 8)
-    canvas_obj.setFillColor(colors.grey)
-    canvas_obj.drawString(
-        30 * mm,
-        10 * mm,
-        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-    )
-    canvas_obj.drawRightString(
-        doc.pagesize[0] - 30 * mm,
-        10 * mm,
-        f"Page {doc.page}"
+    Args:
+        generated_str: Report timestamp, formatted once so every page matches
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.units import mm
+
+    footer_text = f"Generated: {generated_str}"
+
+    def draw_header_footer(canvas_obj, doc):
+        canvas_obj.saveState()
+
+        # Footer
+        canvas_obj.setFont('Helvetica', 8)
+        canvas_obj.setFillColor(colors.grey)
+        canvas_obj.drawString(30 * mm, 10 * mm, footer_text)
+        canvas_obj.drawRightString(
+            doc.pagesize[0] - 30 * mm,
+            10 * mm,
+            f"Page {doc.page}"
+        )
+
+        canvas_obj.restoreState()
+
+    return draw_header_footer
+
+
+def compute_data_hash(team_size, jira_url, data, image_paths=(), trend_inputs=None):
+    """Hash the inputs of a PDF report so unchanged reports can be skipped.
+
+    image_paths are chart PNGs embedded in the report; their bytes are hashed
+    too, so a changed chart forces a rebuild. The trends chart is redrawn
+    with a new point on every logged run, so it is represented by
+    trend_inputs (StatsLogger.get_trend_inputs) rather than its bytes; a
+    run that changes no plotted value can therefore reuse the last PDF.
+    """
+    payload = orjson.dumps(
+        {'team_size': team_size, 'jira_url': jira_url, 'data': data, 'trends': trend_inputs},
+        option=orjson.OPT_SORT_KEYS,
+        default=str
     )
+    digest = hashlib.blake2b(payload)
+    for path in image_paths:
+        digest.update(path.encode())
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
 
-    canvas_obj.restoreState()
 
+def fetch_project_data(client, project_key, board_id, team_size, target_velocity=None, exclude_epics=None):
+    """Fetch and prepare everything the PDF report needs for a single project.
 
-def generate_project_pdf(client, project_key, board_id, team_size, jira_url, target_velocity=None, exclude_epics=None):
-    """Generate PDF report for a single project.
+    This is the network-bound half of report generation; the result is passed
+    to render_project_pdf.
 
     Args:
         exclude_epics: List of epic numbers to exclude (e.g., ['123', '456'])
@@ -151,31 +204,29 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
 
     # Get epic data
     print("Fetching epic data...")
-    url = os.getenv('JIRA_URL').rstrip('/')
-    auth = (os.getenv('JIRA_EMAIL'), os.getenv('JIRA_API_TOKEN'))
-    headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+    # Requests go through the client's pooled session, which carries auth
+    url = client.url
+    headers = {'Content-Type': 'application/json'}
 
-    # Fetch epics from board API (has colour info)
-    board_epic_response = requests.get(
+    # Fetch open epics from board API (has colour info); done epics are
+    # filtered server-side as they are dropped below anyway
+    board_epic_response = client.session.get(
         f'{url}/rest/agile/1.0/board/{board_id}/epic',
-        auth=auth,
-        headers={'Accept': 'application/json'},
-        params={'maxResults': 200}
+        params={'maxResults': 200, 'done': 'false'}
     )
 
-    board_epics = board_epic_response.json().get('values', []) if board_epic_response.status_code == 200 else []
+    board_epics = orjson.loads(board_epic_response.content).get('values', []) if board_epic_response.status_code == 200 else []
     board_epic_keys = {e['key'] for e in board_epics}
 
-    # Fetch all project epics via JQL to catch any not on board
-    jql_response = requests.post(
+    # Probe open project epics via JQL for flagged/priority and any not on board
+    jql_response = client.session.post(
         f'{url}/rest/api/3/search/jql',
-        auth=auth,
         headers=headers,
-        json={
-            'jql': f'project = {project_key.upper()} AND type = Epic',
+        data=orjson.dumps({
+            'jql': OPEN_EPICS_JQL.format(project=project_key.upper()),
             'maxResults': 200,
-            'fields': ['summary', 'status', 'customfield_10021', 'priority']  # customfield_10021 is Flagged
-        }
+            'fields': EPIC_FIELDS
+        })
     )
 
     # Combine: board epics have colour, JQL epics fill gaps
@@ -185,7 +236,7 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
     flagged_epics = {}
     epic_priorities = {}
     if jql_response.status_code == 200:
-        jql_epics = jql_response.json().get('issues', [])
+        jql_epics = orjson.loads(jql_response.content).get('issues', [])
         for issue in jql_epics:
             # Store flagged status (customfield_10021)
             is_flagged = issue['fields'].get('customfield_10021') is not None
@@ -213,36 +264,34 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
     if exclude_keys:
         print(f"  Excluding epics: {', '.join(sorted(exclude_keys))}")
 
+    epic_data = []
     if active_epics:
 
         # Get remaining points for each epic
-        epic_data = []
         for epic in active_epics:
             epic_key = epic['key']
             epic_name = epic.get('summary', epic.get('name', 'Unnamed'))
             epic_colour = epic.get('color', {}).get('key', 'color_4')
 
-            issue_response = requests.post(
+            issue_response = client.session.post(
                 f'{url}/rest/api/3/search/jql',
-                auth=auth,
                 headers=headers,
-                json={
-                    'jql': f'parent = {epic_key}',
+                data=orjson.dumps({
+                    'jql': EPIC_CHILDREN_JQL.format(key=epic_key),
                     'maxResults': 200,
-                    'fields': ['customfield_10016', 'customfield_10026', 'customfield_10031', 'status']
-                }
+                    'fields': EPIC_CHILD_FIELDS
+                })
             )
 
             if issue_response.status_code != 200:
                 continue
 
-            issues = issue_response.json().get('issues', [])
+            issues = orjson.loads(issue_response.content).get('issues', [])
 
             total_points = 0.0
             completed_points = 0.0
             for issue in issues:
-                points = issue['fields'].get('customfield_10016') or issue['fields'].get('customfield_10026') or issue['fields'].get('customfield_10031')
-                points = float(points) if points else 0.0
+                points = client.get_story_points(issue)
                 total_points += points
 
                 status = issue['fields'].get('status', {}).get('name', '').lower()
@@ -254,9 +303,7 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
             if remaining_points > 0:
                 # Get priority number for sorting (lower number = higher priority)
                 priority_name = epic_priorities.get(epic_key, '')
-                priority_num = {'Highest': 1, 'Critical': 1, 'High': 2, 'Major': 2,
-                               'Medium': 3, 'Normal': 3, 'Low': 4, 'Minor': 4,
-                               'Lowest': 5, 'Trivial': 5}.get(priority_name, 99)
+                priority_num = PRIORITY_NUMBERS.get(priority_name, 99)
 
                 epic_data.append({
                     'epic_key': epic_key,
@@ -279,9 +326,8 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
     logger.log_epic_stats(project_key, epic_data)
 
     # Calculate parallel completion dates
-    from datetime import datetime, timedelta
     if velocity_data:
-        last_sprint_end = datetime.fromisoformat(velocity_data[-1]['end_date'].replace('Z', '+00:00'))
+        last_sprint_end = velocity_data[-1]['end_date_dt']
     else:
         last_sprint_end = datetime.now()
 
@@ -310,9 +356,66 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
     final_completion = max(tracks).strftime('%Y-%m-%d') if epic_data else 'N/A'
     sprints_remaining = int(total_remaining / avg_velocity) if avg_velocity > 0 else 0
 
+    return {
+        'velocity_data': velocity_data,
+        'velocity_stats': velocity_stats,
+        'is_target_velocity': is_target_velocity,
+        'actual_velocity': actual_velocity,
+        'epic_data': epic_data,
+        'flagged_epics': flagged_epics,
+        'epic_priorities': epic_priorities,
+        'epic_deltas': epic_deltas,
+        'total_remaining': total_remaining,
+        'final_completion': final_completion,
+        'sprints_remaining': sprints_remaining
+    }
+
+
+def render_project_pdf(project_key, team_size, jira_url, data):
+    """Render the PDF report for a single project from prefetched data.
+
+    This is the CPU-bound half of report generation (matplotlib + ReportLab).
+
+    Args:
+        data: Project data dict returned by fetch_project_data
+    """
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.units import mm
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak, PageTemplate, Frame, NextPageTemplate
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+
+    velocity_data = data['velocity_data']
+    velocity_stats = data['velocity_stats']
+    is_target_velocity = data['is_target_velocity']
+    actual_velocity = data['actual_velocity']
+    avg_velocity = velocity_stats['mean']
+    epic_data = data['epic_data']
+    flagged_epics = data['flagged_epics']
+    epic_priorities = data['epic_priorities']
+    epic_deltas = data['epic_deltas']
+    total_remaining = data['total_remaining']
+    final_completion = data['final_completion']
+    sprints_remaining = data['sprints_remaining']
+
+    # Capture report timestamp once so the title and every page footer agree
+    generated_str = datetime.now().strftime('%Y-%m-%d %H:%M')
+
+    # Skip the build if the last PDF was rendered from identical inputs
+    output_file = f'../public/{project_key}.pdf'
+    hash_file = Path(f'{output_file}.sha')
+    gantt_path = f'../public/{project_key}_gantt.png'
+    trends_path = f'../public/{project_key}_trends.png'
+    from stats_logger import StatsLogger
+    trend_inputs = StatsLogger().get_trend_inputs(project_key) if os.path.exists(trends_path) else None
+    data_hash = compute_data_hash(team_size, jira_url, data, (gantt_path,), trend_inputs)
+    if os.path.exists(output_file) and hash_file.exists() and hash_file.read_text() == data_hash:
+        print(f"✓ PDF report unchanged, skipping build: {output_file}")
+        return output_file
+
     # Create PDF
     print(f"Generating PDF for {project_key.upper()}...")
-    output_file = f'../public/{project_key}.pdf'
 
     doc = SimpleDocTemplate(
         output_file,
@@ -363,7 +466,7 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
         textColor=colors.grey,
         alignment=TA_CENTER
     )
-    story.append(Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", timestamp_style))
+    story.append(Paragraph(f"Generated: {generated_str}", timestamp_style))
     story.append(Spacer(1, 5*mm))
 
     # Metrics summary table (portrait-optimised)
@@ -518,7 +621,6 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
     story.append(PageBreak())
 
     # Gantt chart on landscape page
-    gantt_path = f'../public/{project_key}_gantt.png'
     if os.path.exists(gantt_path):
         img = Image(gantt_path, width=250*mm, height=140*mm, kind='proportional')
         story.append(img)
@@ -591,19 +693,7 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
 
         # Get priority as number (1-5, where 1 is highest)
         priority_name = epic_priorities.get(epic['epic_key'], '')
-        priority_numbers = {
-            'Highest': '1',
-            'Critical': '1',
-            'High': '2',
-            'Major': '2',
-            'Medium': '3',
-            'Normal': '3',
-            'Low': '4',
-            'Minor': '4',
-            'Lowest': '5',
-            'Trivial': '5'
-        }
-        priority = priority_numbers.get(priority_name, '-')
+        priority = str(PRIORITY_NUMBERS.get(priority_name, '-'))
 
         # Status traffic light based on delta
         if delta is None:
@@ -655,7 +745,6 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
     story.append(epic_table)
 
     # Add historical trends chart if it exists
-    trends_path = f'../public/{project_key}_trends.png'
     if os.path.exists(trends_path):
         story.append(PageBreak())
         story.append(Paragraph('Historical Planning Trends', title_style))
@@ -670,12 +759,24 @@ def generate_project_pdf(client, project_key, board_id, team_size, jira_url, tar
         ))
 
     # Build PDF
-    doc.build(story, onFirstPage=create_header_footer, onLaterPages=create_header_footer)
+    header_footer = create_header_footer(generated_str)
+    doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+    hash_file.write_text(data_hash)
 
     print(f"✓ PDF report saved: {output_file}")
     return output_file
 
 
+def generate_project_pdf(client, project_key, board_id, team_size, jira_url, target_velocity=None, exclude_epics=None):
+    """Generate PDF report for a single project.
+
+    Args:
+        exclude_epics: List of epic numbers to exclude (e.g., ['123', '456'])
+    """
+    data = fetch_project_data(client, project_key, board_id, team_size, target_velocity, exclude_epics)
+    return render_project_pdf(project_key, team_size, jira_url, data)
+
+
 def main():
     """Generate PDF reports for all configured projects."""
     load_dotenv()
@@ -693,6 +794,11 @@ def main():
         email=os.getenv('JIRA_EMAIL'),
         api_token=os.getenv('JIRA_API_TOKEN')
     )
+
+    # Discard cached Jira responses when a fresh fetch is requested
+    if '--no-cache' in sys.argv[1:]:
+        client.clear_cache()
+
     jira_url = os.getenv('JIRA_URL', '').rstrip('/')
 
     # Find all project configurations
@@ -740,24 +846,33 @@ def main():
 
     print(f"\nFound {len(projects)} project(s) to process\n")
 
-    # Generate PDF for each project
-    output_files = []
-    for project in projects:
-        print(f"{'='*60}")
-        print(f"Processing project: {project['key'].upper()}")
-        print(f"{'='*60}")
-
-        output_file = generate_project_pdf(
-            client,
-            project['key'],
-            project['board_id'],
-            project['team_size'],
-            jira_url,
-            project.get('target_velocity'),
-            project.get('exclude_epics', [])
-        )
-        output_files.append(output_file)
-        print()
+    # Generate PDF for each project, rendering project N in the background
+    # while the Jira data for project N+1 is fetched
+    render_futures = []
+    with ThreadPoolExecutor(max_workers=1) as render_pool:
+        for project in projects:
+            print(f"{'='*60}")
+            print(f"Processing project: {project['key'].upper()}")
+            print(f"{'='*60}")
+
+            data = fetch_project_data(
+                client,
+                project['key'],
+                project['board_id'],
+                project['team_size'],
+                project.get('target_velocity'),
+                project.get('exclude_epics', [])
+            )
+            render_futures.append(render_pool.submit(
+                render_project_pdf,
+                project['key'],
+                project['team_size'],
+                jira_url,
+                data
+            ))
+            print()
+
+    output_files = [future.result() for future in render_futures]
 
     print(f"\n{'='*60}")
     print(f"✓ All PDF reports generated successfully")
@@ -7,6 +7,15 @@ import json
 import requests
 from dotenv import load_dotenv
 
+# JQL patterns for finding an epic's child issues, tried in order
+EPIC_CHILD_JQL_PATTERNS = (
+    '"Epic Link" = {key}',
+    'parent = {key}',
+    '"Parent Link" = {key}',
+    'issue in childIssuesOf("{key}")',
+)
+SAMPLE_FIELDS = ('*all',)
+
 
 def main():
     """Inspect epic issues."""
@@ -25,30 +34,24 @@ def main():
     project_key = os.getenv('JIRA_PROJECT_KEY', 'project').lower()
 
     auth = (email, api_token)
-    headers = {'Accept': 'application/json'}
+    headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
 
     print(f"Searching for issues related to epic {epic_key}...\n")
 
     # Try different JQL patterns
-    jql_patterns = [
-        f'"Epic Link" = {epic_key}',
-        f'parent = {epic_key}',
-        f'"Parent Link" = {epic_key}',
-        f'issue in childIssuesOf("{epic_key}")',
-    ]
-
-    for jql in jql_patterns:
+    for jql_pattern in EPIC_CHILD_JQL_PATTERNS:
+        jql = jql_pattern.format(key=epic_key)
         print(f"Trying JQL: {jql}")
 
         # Use POST to /rest/api/3/search/jql as per migration guide
         response = requests.post(
             f'{url}/rest/api/3/search/jql',
             auth=auth,
-            headers={**headers, 'Content-Type': 'application/json'},
+            headers=headers,
             json={
                 'jql': jql,
                 'maxResults': 5,
-                'fields': ['*all']
+                'fields': SAMPLE_FIELDS
             }
         )
 
@@ -1,118 +1,309 @@
 """Jira API client for extracting planning data."""
 
-import requests
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import orjson
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pathlib import Path
+from typing import Any, Iterator
 import os
+import re
+
+
+# Cache file lives at the repo root whatever directory the scripts run from
+CACHE_PATH = Path(__file__).resolve().parent.parent / '.jira_cache'
 
 
 class JiraClient:
     """Client for interacting with Jira REST API."""
 
+    # Default fields for sprint issue fetches; callers that only need points
+    # and status should pass a narrower list to shrink the response
+    SPRINT_ISSUE_FIELDS = 'summary,status,customfield_10016,customfield_10026,customfield_10031,issuetype,created,resolutiondate'
+
+    # Story point fields in lookup order, and statuses that count as complete;
+    # scripts that scan issues inline should use these rather than copies
+    POINT_FIELDS = ('customfield_10016', 'customfield_10026', 'customfield_10031')
+    COMPLETED_STATUSES = frozenset({'done', 'closed', 'resolved'})
+
     def __init__(self, url: str, email: str, api_token: str):
         self.url = url.rstrip('/')
         self.auth = (email, api_token)
         self.headers = {'Accept': 'application/json'}
 
-    def _get(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-        """Make GET request to Jira API."""
-        response = requests.get(
-            f'{self.url}/rest/agile/1.0{endpoint}',
-            auth=self.auth,
-            headers=self.headers,
-            params=params or {}
+        # Jira Cloud caps pages at 100; Data Center allows up to 1000
+        self.page_size = int(os.getenv('JIRA_PAGE_SIZE', '100'))
+        # Largest page each endpoint has actually returned once it capped a
+        # request, keyed by the endpoint with IDs removed (e.g. /board/{id}/sprint)
+        self.page_caps: dict[str, int] = {}
+
+        # Shared session reuses keep-alive connections across paginated calls;
+        # the pool is sized to cover the scripts' JIRA_CONCURRENCY worker threads.
+        # Responses are cached on disk for 5 minutes so back-to-back runs skip
+        # identical requests (Jira's own no-store headers are deliberately ignored)
+        self.session = requests_cache.CachedSession(
+            str(CACHE_PATH),
+            backend='sqlite',
+            expire_after=300,
+            allowable_methods=['GET', 'POST']
+        )
+        self.session.auth = self.auth
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=max(20, int(os.getenv('JIRA_CONCURRENCY', '8'))),
+            # Once retries run out, return the final response so callers'
+            # raise_for_status() and status checks see the error as before
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False
+            )
         )
-        response.raise_for_status()
-        return response.json()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
-    def get_board_sprints(self, board_id: int, max_results: int = 50) -> list[dict[str, Any]]:
-        """Get all sprints for a board, including completed ones."""
-        sprints = []
-        start_at = 0
+        # JIRA_NO_CACHE does for any script what --no-cache does for generate_*
+        if os.getenv('JIRA_NO_CACHE'):
+            self.clear_cache()
 
-        while True:
-            data = self._get(
-                f'/board/{board_id}/sprint',
-                params={'startAt': start_at, 'maxResults': max_results}
-            )
-            sprints.extend(data.get('values', []))
+    def clear_cache(self) -> None:
+        """Discard all cached Jira responses."""
+        self.session.cache.clear()
 
-            if data.get('isLast', True):
-                break
-            start_at += max_results
+    def _get(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        expire_after: Any = None,
+        force_refresh: bool = False
+    ) -> dict[str, Any]:
+        """Make GET request to Jira API.
 
-        return sprints
+        expire_after overrides the session cache lifetime for this request;
+        force_refresh fetches from Jira even if a cached response exists.
+        """
+        # Stream so error responses are rejected before their body is read
+        with self.session.get(
+            f'{self.url}/rest/agile/1.0{endpoint}',
+            params=params or {},
+            expire_after=expire_after,
+            force_refresh=force_refresh,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            return orjson.loads(response.content)
 
-    def get_sprint_issues(self, sprint_id: int) -> list[dict[str, Any]]:
-        """Get all issues in a sprint with story points."""
-        issues = []
-        start_at = 0
-        max_results = 50
+    @staticmethod
+    def _endpoint_key(endpoint: str) -> str:
+        """Return an endpoint path with its numeric IDs replaced by {id}."""
+        return re.sub(r'/\d+', '/{id}', endpoint)
 
-        while True:
-            data = self._get(
-                f'/sprint/{sprint_id}/issue',
-                params={
-                    'startAt': start_at,
-                    'maxResults': max_results,
-                    'fields': 'summary,status,customfield_10016,customfield_10026,customfield_10031,issuetype,created,resolutiondate'
-                }
-            )
-            issues.extend(data.get('issues', []))
+    def _check_page_cap(self, endpoint: str, requested: int, returned: int, has_more: bool) -> int:
+        """Return the page size to continue paginating with.
 
-            if start_at + max_results >= data.get('total', 0):
-                break
-            start_at += max_results
+        Jira silently caps maxResults, so if the first page came back short
+        while more results remain, warn and continue with the observed size.
+        Caps differ between endpoints, so each one's cap is remembered under
+        its ID-free path; later requests to it ask for the cap directly and
+        the warning is only printed once.
+        """
+        if has_more and 0 < returned < requested:
+            print(f"Warning: Jira capped page size for {endpoint} at {returned} (requested {requested})")
+            self.page_caps[self._endpoint_key(endpoint)] = returned
+            return returned
+        return requested
 
-        return issues
+    def _paginate(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        list_key: str,
+        max_results: int | None = None,
+        expire_after: Any = None,
+        force_refresh: bool = False
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every item from a startAt-paginated agile endpoint.
 
-    def get_epics(self, board_id: int) -> list[dict[str, Any]]:
-        """Get all epics for a board."""
-        epics = []
+        list_key is 'values' for board endpoints (which report isLast) or
+        'issues' for issue endpoints (which report total).
+        """
         start_at = 0
-        max_results = 50
+        max_results = max_results or self.page_size
+        page_cap = self.page_caps.get(self._endpoint_key(endpoint))
+        if page_cap:
+            max_results = min(max_results, page_cap)
 
         while True:
             data = self._get(
-                f'/board/{board_id}/epic',
-                params={'startAt': start_at, 'maxResults': max_results}
+                endpoint,
+                params={**params, 'startAt': start_at, 'maxResults': max_results},
+                expire_after=expire_after,
+                force_refresh=force_refresh
             )
-            epics.extend(data.get('values', []))
+            page = data.get(list_key, [])
+            yield from page
 
-            if data.get('isLast', True):
+            if 'isLast' in data or 'total' not in data:
+                has_more = not data.get('isLast', True)
+            else:
+                has_more = start_at + len(page) < data['total']
+            if not has_more or not page:
                 break
+            if start_at == 0:
+                max_results = self._check_page_cap(endpoint, max_results, len(page), True)
             start_at += max_results
 
-        return epics
+    def get_board_sprints(
+        self,
+        board_id: int,
+        max_results: int | None = None,
+        state: str | None = None,
+        force_refresh: bool = False
+    ) -> list[dict[str, Any]]:
+        """Get all sprints for a board, including completed ones.
 
-    def get_epic_issues(self, epic_key: str) -> list[dict[str, Any]]:
-        """Get all issues in an epic using JQL search."""
+        state filters server-side (e.g. 'closed' or 'active,future').
+        """
+        params = {'state': state} if state else {}
+        return list(self._paginate(
+            f'/board/{board_id}/sprint', params, 'values', max_results, force_refresh=force_refresh
+        ))
+
+    def get_sprint_issues(
+        self,
+        sprint_id: int,
+        closed: bool = False,
+        max_results: int | None = None,
+        fields: str | None = None,
+        force_refresh: bool = False
+    ) -> list[dict[str, Any]]:
+        """Get all issues in a sprint with story points.
+
+        Closed sprints no longer change, so their responses are cached indefinitely.
+        fields is a comma-separated field list (defaults to SPRINT_ISSUE_FIELDS).
+        """
+        return list(self._paginate(
+            f'/sprint/{sprint_id}/issue',
+            {'fields': fields or self.SPRINT_ISSUE_FIELDS},
+            'issues',
+            max_results,
+            expire_after=requests_cache.NEVER_EXPIRE if closed else None,
+            force_refresh=force_refresh
+        ))
+
+    def get_issues_for_sprints(
+        self,
+        sprint_ids: list[int],
+        closed: bool = False,
+        fields: str | None = None
+    ) -> dict[int, list[dict[str, Any]]]:
+        """Get the issues of several sprints concurrently, keyed by sprint ID.
+
+        The result is ordered as sprint_ids.
+        """
+        results = dict(self.iter_issues_for_sprints(sprint_ids, closed=closed, fields=fields))
+        return {sprint_id: results[sprint_id] for sprint_id in sprint_ids}
+
+    def iter_issues_for_sprints(
+        self,
+        sprint_ids: list[int],
+        closed: bool = False,
+        fields: str | None = None,
+        force_refresh: bool = False
+    ) -> Iterator[tuple[int, list[dict[str, Any]]]]:
+        """Yield (sprint ID, issues) pairs as each sprint's fetch completes.
+
+        Up to JIRA_CONCURRENCY requests run at once over the shared session.
+        """
+        max_workers = int(os.getenv('JIRA_CONCURRENCY', '8'))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.get_sprint_issues, sprint_id, closed=closed, fields=fields, force_refresh=force_refresh
+                ): sprint_id
+                for sprint_id in sprint_ids
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def get_epics(self, board_id: int, max_results: int | None = None) -> list[dict[str, Any]]:
+        """Get all epics for a board."""
+        return list(self._paginate(f'/board/{board_id}/epic', {}, 'values', max_results))
+
+    def search_issues(self, jql: str, fields: list[str], max_results: int | None = None) -> list[dict[str, Any]]:
+        """Get all issues matching a JQL query.
+
+        Uses the cursor-based /search/jql endpoint, following nextPageToken
+        until the last page rather than re-skipping results with startAt.
+        """
         issues = []
-        start_at = 0
-        max_results = 50
+        body = {
+            'jql': jql,
+            'fields': fields,
+            'maxResults': max_results or self.page_size
+        }
 
         while True:
-            response = requests.get(
-                f'{self.url}/rest/api/3/search',
-                auth=self.auth,
-                headers=self.headers,
-                params={
-                    'jql': f'parent = {epic_key}',
-                    'startAt': start_at,
-                    'maxResults': max_results,
-                    'fields': 'summary,status,customfield_10016,issuetype'
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
+            with self.session.post(
+                f'{self.url}/rest/api/3/search/jql',
+                headers={'Content-Type': 'application/json'},
+                data=orjson.dumps(body),
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                data = orjson.loads(response.content)
 
             issues.extend(data.get('issues', []))
 
-            if start_at + max_results >= data.get('total', 0):
+            next_page_token = data.get('nextPageToken')
+            if data.get('isLast', True) or not next_page_token:
                 break
-            start_at += max_results
+            body['nextPageToken'] = next_page_token
+
+        return issues
+
+    def get_child_issues(
+        self,
+        parent_keys: list[str],
+        fields: list[str],
+        chunk_size: int = 50
+    ) -> list[dict[str, Any]]:
+        """Get the child issues of many parents with one search per chunk.
+
+        Keys are batched into `parent in (...)` queries of chunk_size to stay
+        under JQL length limits; the JQL travels in a JSON POST body, not the
+        URL. The parent field is always requested so callers can group
+        results by issue['fields']['parent']['key'].
+        """
+        if 'parent' not in fields:
+            fields = [*fields, 'parent']
+
+        issues = []
+        for i in range(0, len(parent_keys), chunk_size):
+            keys = ','.join(parent_keys[i:i + chunk_size])
+            issues.extend(self.search_issues(f'parent in ({keys})', fields))
 
         return issues
 
+    def get_epic_issues(
+        self,
+        epic_key: str,
+        max_results: int | None = None,
+        fields: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Get all issues in an epic using JQL search.
+
+        Fetches only status and story points unless fields is given.
+        """
+        return self.search_issues(
+            f'parent = {epic_key}',
+            fields or ['status', 'customfield_10016', 'customfield_10026', 'customfield_10031'],
+            max_results
+        )
+
     def get_story_points(self, issue: dict[str, Any]) -> float:
         """Extract story points from an issue.
 
@@ -120,19 +311,21 @@ class JiraClient:
         - customfield_10016: Story Points (CIT project)
         - customfield_10026: Story point estimate
         - customfield_10031: Story Points (IVEMCS project)
-        Uses whichever field is populated.
+        Uses the first field that is set, so an explicit 0 is kept rather
+        than falling through to the next field.
         """
         fields = issue.get('fields', {})
 
         # Try common story point fields in order
-        for field_id in ['customfield_10016', 'customfield_10026', 'customfield_10031']:
+        for field_id in self.POINT_FIELDS:
             story_points = fields.get(field_id)
-            if story_points:
-                return float(story_points)
+            if story_points is not None:
+                # Jira returns numbers as floats already
+                return story_points if type(story_points) is float else float(story_points)
 
         return 0.0
 
     def is_issue_completed(self, issue: dict[str, Any]) -> bool:
         """Check if an issue is completed based on status."""
         status = issue.get('fields', {}).get('status', {}).get('name', '').lower()
-        return status in ['done', 'closed', 'resolved']
+        return status in self.COMPLETED_STATUSES
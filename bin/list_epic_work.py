@@ -3,9 +3,51 @@
 
 import os
 import sys
-import json
-import requests
+from collections import defaultdict
+from operator import itemgetter
 from dotenv import load_dotenv
+import orjson
+import requests
+
+from jira_client import JiraClient
+
+
+def aggregate_points(issues):
+    """Total story points per parent epic in a single pass over the issues.
+
+    Returns a mapping of epic key to [total points, completed points, issue count].
+    """
+    agg = defaultdict(lambda: [0.0, 0.0, 0])
+    completed_statuses = JiraClient.COMPLETED_STATUSES
+
+    for issue in issues:
+        fields = issue['fields']
+        # Get story points (customfield_10016 is common)
+        points = float(fields.get('customfield_10016') or 0.0)
+        done = fields.get('status', {}).get('name', '').lower() in completed_statuses
+
+        totals = agg[fields['parent']['key']]
+        totals[0] += points
+        if done:
+            totals[1] += points
+        totals[2] += 1
+
+    return agg
+
+
+def summarise_epic(epic, totals):
+    """Summarise an epic from its aggregated story point totals."""
+    total_points, completed_points, issue_count = totals
+
+    return {
+        'key': epic['key'],
+        'name': epic.get('summary', epic.get('name', 'Unnamed'))[:50],
+        'total': total_points,
+        'completed': completed_points,
+        'remaining': total_points - completed_points,
+        'issue_count': issue_count,
+        'pct': (completed_points / total_points * 100) if total_points > 0 else 0
+    }
 
 
 def main():
@@ -19,99 +61,58 @@ def main():
         print(f"Error: Missing required environment variables: {', '.join(missing_vars)}")
         sys.exit(1)
 
-    url = os.getenv('JIRA_URL').rstrip('/')
-    email = os.getenv('JIRA_EMAIL')
-    api_token = os.getenv('JIRA_API_TOKEN')
-    project_key = os.getenv('JIRA_PROJECT_KEY')
+    client = JiraClient(
+        url=os.getenv('JIRA_URL'),
+        email=os.getenv('JIRA_EMAIL'),
+        api_token=os.getenv('JIRA_API_TOKEN')
+    )
+    url = client.url
     board_id = int(os.getenv('JIRA_BOARD_ID'))
 
-    auth = (email, api_token)
-    headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
-
     # Get epics from board using agile API
     print("Fetching epics from board...")
-    epic_response = requests.get(
-        f'{url}/rest/agile/1.0/board/{board_id}/epic',
-        auth=auth,
-        headers={'Accept': 'application/json'},
-        params={'maxResults': 100}
-    )
-
-    if epic_response.status_code != 200:
-        print(f"Error fetching epics: {epic_response.status_code}")
-        print(epic_response.text)
+    try:
+        with client.session.get(
+            f'{url}/rest/agile/1.0/board/{board_id}/epic',
+            params={'maxResults': 100},
+            stream=True
+        ) as epic_response:
+            epic_response.raise_for_status()
+            epics = orjson.loads(epic_response.content).get('values', [])
+    except requests.HTTPError as e:
+        print(f"Error fetching epics: {e}")
         sys.exit(1)
-
-    epics = epic_response.json().get('values', [])
     active_epics = [e for e in epics if not e.get('done', False)]
 
     print(f"Found {len(active_epics)} active epics")
 
-    # For each epic, get child issues
-    epic_data = []
-
-    for epic in active_epics:
-        epic_key = epic['key']
-        epic_name = epic.get('summary', epic.get('name', 'Unnamed'))[:50]
-
-        # Search for issues with this epic as parent using new endpoint
-        jql = f'parent = {epic_key}'
-
-        issue_response = requests.post(
-            f'{url}/rest/api/3/search/jql',
-            auth=auth,
-            headers=headers,
-            json={
-                'jql': jql,
-                'maxResults': 200,
-                'fields': ['summary', 'status', 'customfield_10016', 'issuetype']
-            }
+    # Fetch every epic's child issues in batched searches, then total by parent
+    try:
+        issues = client.get_child_issues(
+            [e['key'] for e in active_epics],
+            ['status', 'customfield_10016']
         )
+    except requests.HTTPError as e:
+        print(f"Error fetching epic issues: {e}")
+        sys.exit(1)
 
-        if issue_response.status_code != 200:
-            print(f"Warning: Could not fetch issues for {epic_key}")
-            continue
-
-        issues = issue_response.json().get('issues', [])
-
-        total_points = 0.0
-        completed_points = 0.0
-        remaining_points = 0.0
-
-        for issue in issues:
-            # Get story points (customfield_10016 is common)
-            points = issue['fields'].get('customfield_10016')
-            points = float(points) if points else 0.0
-            total_points += points
-
-            # Check if completed
-            status = issue['fields'].get('status', {}).get('name', '').lower()
-            if status in ['done', 'closed', 'resolved']:
-                completed_points += points
-            else:
-                remaining_points += points
-
-        epic_data.append({
-            'key': epic_key,
-            'name': epic_name,
-            'total': total_points,
-            'completed': completed_points,
-            'remaining': remaining_points,
-            'issue_count': len(issues),
-            'pct': (completed_points / total_points * 100) if total_points > 0 else 0
-        })
+    agg = aggregate_points(issues)
+    epic_data = [summarise_epic(epic, agg.get(epic['key'], (0.0, 0.0, 0))) for epic in active_epics]
 
     # Sort by remaining work
-    epic_data.sort(key=lambda e: e['remaining'], reverse=True)
+    epic_data.sort(key=itemgetter('remaining'), reverse=True)
 
     # Print table
     print("\n" + "="*120)
     print(f"{'Epic Key':<15} {'Epic Name':<52} {'Remaining':>12} {'Completed':>12} {'Total':>12} {'Progress':>10}")
     print("-"*120)
 
-    for e in epic_data:
-        print(f"{e['key']:<15} {e['name']:<52} {e['remaining']:>11.1f}  "
-              f"{e['completed']:>11.1f}  {e['total']:>11.1f}  {e['pct']:>9.1f}%")
+    # Write all rows in one call rather than one print per epic
+    sys.stdout.write(''.join(
+        f"{e['key']:<15} {e['name']:<52} {e['remaining']:>11.1f}  "
+        f"{e['completed']:>11.1f}  {e['total']:>11.1f}  {e['pct']:>9.1f}%\n"
+        for e in epic_data
+    ))
 
     print("-"*120)
 
@@ -136,9 +137,10 @@ def main():
 
     if total_remaining > 0:
         print(f"\nTop epics by remaining work:")
-        for e in epic_data[:5]:
-            if e['remaining'] > 0:
-                print(f"  {e['key']}: {e['remaining']:.1f} points - {e['name']}")
+        sys.stdout.write(''.join(
+            f"  {e['key']}: {e['remaining']:.1f} points - {e['name']}\n"
+            for e in epic_data[:5] if e['remaining'] > 0
+        ))
 
 
 if __name__ == '__main__':
@@ -3,42 +3,50 @@
 
 import os
 import sys
+from operator import itemgetter
 from dotenv import load_dotenv
 import requests
 
 from jira_client import JiraClient
 
+# Different Jira versions use different fields for epic links
+EPIC_JQL_PATTERNS = [
+    '"Parent Link" = {key}',  # Newer Jira
+    'parent = {key}',  # Some Jira versions
+    '"Epic Link" = {key}',  # Older Jira (deprecated but might work)
+    'issue in childIssuesOf("{key}")',  # Alternative syntax
+]
+
 
 def get_epic_issues_by_jql(client: JiraClient, epic_key: str) -> list:
-    """Try multiple JQL patterns to find issues linked to an epic."""
-    # Different Jira versions use different fields for epic links
-    jql_patterns = [
-        f'"Parent Link" = {epic_key}',  # Newer Jira
-        f'parent = {epic_key}',  # Some Jira versions
-        f'"Epic Link" = {epic_key}',  # Older Jira (deprecated but might work)
-        f'issue in childIssuesOf("{epic_key}")',  # Alternative syntax
-    ]
-
-    for jql in jql_patterns:
+    """Try multiple JQL patterns to find issues linked to an epic.
+
+    The first pattern that finds issues is remembered on the client and
+    tried first for later epics.
+    """
+    working = getattr(client, '_working_epic_jql_pattern', None)
+    patterns = EPIC_JQL_PATTERNS
+    if working:
+        patterns = [working] + [p for p in EPIC_JQL_PATTERNS if p != working]
+
+    for pattern in patterns:
+        jql = pattern.format(key=epic_key)
         try:
-            response = requests.get(
-                f'{client.url}/rest/api/3/search',
-                auth=client.auth,
-                headers=client.headers,
-                params={
-                    'jql': jql,
-                    'maxResults': 100,
-                    'fields': 'summary,status,customfield_10016,issuetype'
-                }
+            # POST the JQL as JSON rather than URL-encoding it into a GET
+            issues = client.search_issues(
+                jql,
+                ['status', *JiraClient.POINT_FIELDS]
             )
 
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('total', 0) > 0:
-                    return data.get('issues', [])
-            elif response.status_code != 400 and response.status_code != 410:
-                # If it's not a "bad request" or "gone", might be auth or other issue
-                print(f"Unexpected status {response.status_code} for JQL: {jql}")
+            if issues:
+                client._working_epic_jql_pattern = pattern
+                return issues
+
+        except requests.HTTPError as e:
+            # A "bad request" or "gone" just means this pattern is unsupported;
+            # anything else might be auth or another issue
+            if e.response.status_code not in (400, 410):
+                print(f"Unexpected status {e.response.status_code} for JQL: {jql}")
 
         except Exception as e:
             print(f"Error trying JQL pattern '{jql}': {e}")
@@ -47,6 +55,43 @@ def get_epic_issues_by_jql(client: JiraClient, epic_key: str) -> list:
     return []
 
 
+def summarise_epic(client: JiraClient, epic: dict, issues: list) -> dict:
+    """Summarise the story points of an epic's child issues."""
+    epic_key = epic.get('key', 'Unknown')
+    epic_name = epic.get('name', 'Unnamed Epic')
+
+    total_points = 0.0
+    remaining_points = 0.0
+    completed_points = 0.0
+    issue_count = len(issues)
+    remaining_count = 0
+
+    # Bind the lookups locally; the status check is inlined to save a call per issue
+    get_points = client.get_story_points
+    completed_statuses = JiraClient.COMPLETED_STATUSES
+
+    for issue in issues:
+        points = get_points(issue)
+        total_points += points
+
+        if issue.get('fields', {}).get('status', {}).get('name', '').lower() in completed_statuses:
+            completed_points += points
+        else:
+            remaining_points += points
+            remaining_count += 1
+
+    return {
+        'key': epic_key,
+        'name': epic_name,
+        'total_points': total_points,
+        'completed_points': completed_points,
+        'remaining_points': remaining_points,
+        'total_issues': issue_count,
+        'remaining_issues': remaining_count,
+        'completion_pct': (completed_points / total_points * 100) if total_points > 0 else 0
+    }
+
+
 def main():
     """List epics with remaining story points."""
     load_dotenv()
@@ -74,49 +119,33 @@ def main():
     active_epics = [e for e in epics if not e.get('done', False)]
     print(f"Found {len(active_epics)} active (not done) epics\n")
 
-    epic_summary = []
+    # Fetch every epic's child issues in batched `parent in (...)` searches
+    print("Fetching epic issues...")
+    issues_by_epic = {}
+    try:
+        issues = client.get_child_issues(
+            [e['key'] for e in active_epics],
+            ['status', *JiraClient.POINT_FIELDS]
+        )
+        for issue in issues:
+            issues_by_epic.setdefault(issue['fields']['parent']['key'], []).append(issue)
+    except requests.HTTPError as e:
+        print(f"Batched parent search failed ({e.response.status_code}), trying per-epic patterns")
 
+    # Older Jira links children via "Epic Link" rather than parent, so fall
+    # back to probing JQL patterns for epics the batched search missed
+    epic_summary = []
     for epic in active_epics:
         epic_key = epic.get('key', 'Unknown')
-        epic_name = epic.get('name', 'Unnamed Epic')
-
-        print(f"Fetching issues for {epic_key}: {epic_name}...")
-
-        # Try to get issues using different JQL patterns
-        issues = get_epic_issues_by_jql(client, epic_key)
-
+        issues = issues_by_epic.get(epic_key)
         if not issues:
-            print(f"  Warning: Could not find issues for {epic_key} (might have no child issues)")
-
-        total_points = 0.0
-        remaining_points = 0.0
-        completed_points = 0.0
-        issue_count = len(issues)
-        remaining_count = 0
-
-        for issue in issues:
-            points = client.get_story_points(issue)
-            total_points += points
-
-            if client.is_issue_completed(issue):
-                completed_points += points
-            else:
-                remaining_points += points
-                remaining_count += 1
-
-        epic_summary.append({
-            'key': epic_key,
-            'name': epic_name,
-            'total_points': total_points,
-            'completed_points': completed_points,
-            'remaining_points': remaining_points,
-            'total_issues': issue_count,
-            'remaining_issues': remaining_count,
-            'completion_pct': (completed_points / total_points * 100) if total_points > 0 else 0
-        })
+            issues = get_epic_issues_by_jql(client, epic_key)
+            if not issues:
+                print(f"  Warning: Could not find issues for {epic_key} (might have no child issues)")
+        epic_summary.append(summarise_epic(client, epic, issues))
 
     # Sort by remaining points (descending)
-    epic_summary.sort(key=lambda e: e['remaining_points'], reverse=True)
+    epic_summary.sort(key=itemgetter('remaining_points'), reverse=True)
 
     # Print summary table
     print("\n" + "="*100)
@@ -125,12 +154,15 @@ def main():
     print(f"{'Epic Key':<15} {'Epic Name':<35} {'Remaining':<12} {'Completed':<12} {'Total':<12} {'%':<8}")
     print("-"*100)
 
-    for epic in epic_summary:
-        print(f"{epic['key']:<15} {epic['name'][:34]:<35} "
-              f"{epic['remaining_points']:>10.1f}  "
-              f"{epic['completed_points']:>10.1f}  "
-              f"{epic['total_points']:>10.1f}  "
-              f"{epic['completion_pct']:>6.1f}%")
+    # Write all rows in one call rather than one print per epic
+    sys.stdout.write(''.join(
+        f"{epic['key']:<15} {epic['name'][:34]:<35} "
+        f"{epic['remaining_points']:>10.1f}  "
+        f"{epic['completed_points']:>10.1f}  "
+        f"{epic['total_points']:>10.1f}  "
+        f"{epic['completion_pct']:>6.1f}%\n"
+        for epic in epic_summary
+    ))
 
     print("-"*100)
     total_remaining = sum(e['remaining_points'] for e in epic_summary)
@@ -6,6 +6,8 @@ import sys
 from dotenv import load_dotenv
 import requests
 
+from jira_client import JiraClient
+
 
 def main():
     """List epics with their story points."""
@@ -19,38 +21,27 @@ def main():
         print("Please add JIRA_PROJECT_KEY to your .env file (e.g., JIRA_PROJECT_KEY=CIT)")
         sys.exit(1)
 
-    url = os.getenv('JIRA_URL').rstrip('/')
-    email = os.getenv('JIRA_EMAIL')
-    api_token = os.getenv('JIRA_API_TOKEN')
+    client = JiraClient(
+        url=os.getenv('JIRA_URL'),
+        email=os.getenv('JIRA_EMAIL'),
+        api_token=os.getenv('JIRA_API_TOKEN')
+    )
     project_key = os.getenv('JIRA_PROJECT_KEY')
 
-    auth = (email, api_token)
-    headers = {'Accept': 'application/json'}
-
     print(f"Searching for epics in project {project_key}...")
 
     # Search for all epics in the project
     jql = f'project = {project_key} AND type = Epic ORDER BY created DESC'
 
-    response = requests.get(
-        f'{url}/rest/api/3/search',
-        auth=auth,
-        headers=headers,
-        params={
-            'jql': jql,
-            'maxResults': 100,
-            'fields': 'summary,status,customfield_10016,customfield_10011,issuetype,created'
-        }
-    )
-
-    if response.status_code != 200:
-        print(f"Error: {response.status_code}")
-        print(response.text)
+    try:
+        epics = client.search_issues(
+            jql,
+            ['summary', 'status']
+        )
+    except requests.HTTPError as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
-    data = response.json()
-    epics = data.get('issues', [])
-
     print(f"Found {len(epics)} epics\n")
 
     # Now for each epic, search for child issues
@@ -62,6 +53,8 @@ def main():
 
     total_remaining_all = 0.0
     total_all_all = 0.0
+    rows = []
+    completed_statuses = JiraClient.COMPLETED_STATUSES
 
     for epic in epics:
         epic_key = epic['key']
@@ -76,41 +69,34 @@ def main():
         # Try the issues() API endpoint which should work
         child_jql = f'parent = {epic_key}'
 
-        child_response = requests.get(
-            f'{url}/rest/api/3/search',
-            auth=auth,
-            headers=headers,
-            params={
-                'jql': child_jql,
-                'maxResults': 100,
-                'fields': 'summary,status,customfield_10016'
-            }
-        )
+        try:
+            issues = client.search_issues(child_jql, ['status', 'customfield_10016'])
+        except requests.HTTPError:
+            issues = []
 
         total_points = 0.0
         remaining_points = 0.0
 
-        if child_response.status_code == 200:
-            child_data = child_response.json()
-            issues = child_data.get('issues', [])
+        for issue in issues:
+            fields = issue['fields']
 
-            for issue in issues:
-                # Get story points (customfield_10016 is typical, might be different)
-                points_field = issue['fields'].get('customfield_10016')
-                points = float(points_field) if points_field else 0.0
-                total_points += points
+            # Get story points (customfield_10016 is typical, might be different)
+            points_field = fields.get('customfield_10016')
+            points = float(points_field) if points_field else 0.0
+            total_points += points
 
-                # Check if issue is not done
-                issue_status = issue['fields']['status']['name'].lower()
-                if issue_status not in ['done', 'closed', 'resolved']:
-                    remaining_points += points
+            # Check if issue is not done
+            if fields['status']['name'].lower() not in completed_statuses:
+                remaining_points += points
 
-        print(f"{epic_key:<15} {epic_status:<15} {epic_summary[:39]:<40} "
-              f"{remaining_points:>10.1f}  {total_points:>10.1f}")
+        rows.append(f"{epic_key:<15} {epic_status:<15} {epic_summary[:39]:<40} "
+                    f"{remaining_points:>10.1f}  {total_points:>10.1f}\n")
 
         total_remaining_all += remaining_points
         total_all_all += total_points
 
+    # Write all rows in one call rather than one print per epic
+    sys.stdout.write(''.join(rows))
     print("-"*100)
     print(f"{'TOTAL':<15} {'':<15} {'':<40} {total_remaining_all:>10.1f}  {total_all_all:>10.1f}")
     print("="*100)
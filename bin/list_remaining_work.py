@@ -3,11 +3,66 @@
 
 import os
 import sys
+from collections import defaultdict
+from operator import itemgetter
 from dotenv import load_dotenv
+import requests
 
 from jira_client import JiraClient
 
 
+POINT_QUERY_FIELDS = ['status', *JiraClient.POINT_FIELDS]
+
+
+def aggregate_points(client, issues, epic_key=None):
+    """Total story points per parent epic in a single pass over the issues.
+
+    Issues are grouped by their parent field, or all under epic_key if given
+    (issues linked via Epic Link carry no parent).
+
+    Returns a mapping of epic key to [total points, completed points].
+    """
+    agg = defaultdict(lambda: [0.0, 0.0])
+
+    for issue in issues:
+        points = client.get_story_points(issue)
+        totals = agg[epic_key or issue['fields']['parent']['key']]
+        totals[0] += points
+        if client.is_issue_completed(issue):
+            totals[1] += points
+
+    return agg
+
+
+def fetch_epic_issues(client, epic):
+    """Fetch an epic's issues from the agile epic endpoint.
+
+    This also finds children linked via Epic Link, which the batched parent
+    search misses on older Jira. A failed fetch is reported and skipped.
+    """
+    try:
+        return list(client._paginate(
+            f'/epic/{epic["id"]}/issue', {'fields': ','.join(POINT_QUERY_FIELDS)}, 'issues'
+        ))
+    except requests.HTTPError as e:
+        print(f"Error fetching issues for {epic['key']}: {e}")
+        return []
+
+
+def summarise_epic(epic, totals):
+    """Summarise an epic from its aggregated story point totals."""
+    total_points, completed_points = totals
+
+    return {
+        'key': epic['key'],
+        'name': epic.get('name', 'Unnamed'),
+        'total': total_points,
+        'remaining': total_points - completed_points,
+        'completed': completed_points,
+        'pct': completed_points / total_points * 100 if total_points > 0 else 0
+    }
+
+
 def main():
     """List epics with remaining work."""
     load_dotenv()
@@ -39,55 +94,37 @@ def main():
         print("No active epics found.")
         return
 
-    # Build epic summary
-    epic_data = []
+    # Fetch every epic's child issues in batched searches, then total by parent
+    agg = {}
+    try:
+        issues = client.get_child_issues([e['key'] for e in active_epics], POINT_QUERY_FIELDS)
+        agg = aggregate_points(client, issues)
+    except requests.HTTPError as e:
+        print(f"Batched parent search failed ({e.response.status_code}), fetching per epic")
 
+    # Older Jira links children via "Epic Link" rather than parent, so fall
+    # back to the agile epic endpoint for epics the batched search missed
     for epic in active_epics:
-        epic_key = epic['key']
-        epic_name = epic.get('name', 'Unnamed')
-
-        # Use the agile API to get epic issues directly
-        # This uses the same endpoint the UI uses
-        try:
-            response = client._get(f'/epic/{epic["id"]}/issue', params={
-                'fields': 'summary,status,customfield_10016',
-                'maxResults': 200
-            })
-            issues = response.get('issues', [])
-        except Exception:
-            # If epic endpoint fails, skip this epic
-            issues = []
-
-        total_points = 0.0
-        remaining_points = 0.0
-
-        for issue in issues:
-            points = client.get_story_points(issue)
-            total_points += points
-
-            if not client.is_issue_completed(issue):
-                remaining_points += points
-
-        epic_data.append({
-            'key': epic_key,
-            'name': epic_name,
-            'total': total_points,
-            'remaining': remaining_points,
-            'completed': total_points - remaining_points,
-            'pct': (total_points - remaining_points) / total_points * 100 if total_points > 0 else 0
-        })
+        if epic['key'] not in agg:
+            agg.update(aggregate_points(client, fetch_epic_issues(client, epic), epic['key']))
+
+    # Build epic summary
+    epic_data = [summarise_epic(epic, agg.get(epic['key'], (0.0, 0.0))) for epic in active_epics]
 
     # Sort by remaining work
-    epic_data.sort(key=lambda e: e['remaining'], reverse=True)
+    epic_data.sort(key=itemgetter('remaining'), reverse=True)
 
     # Print table
     print("="*110)
     print(f"{'Epic':<15} {'Name':<40} {'Remaining':>12} {'Completed':>12} {'Total':>12} {'Progress':>10}")
     print("-"*110)
 
-    for e in epic_data:
-        print(f"{e['key']:<15} {e['name'][:39]:<40} {e['remaining']:>11.1f}  "
-              f"{e['completed']:>11.1f}  {e['total']:>11.1f}  {e['pct']:>9.1f}%")
+    # Write all rows in one call rather than one print per epic
+    sys.stdout.write(''.join(
+        f"{e['key']:<15} {e['name'][:39]:<40} {e['remaining']:>11.1f}  "
+        f"{e['completed']:>11.1f}  {e['total']:>11.1f}  {e['pct']:>9.1f}%\n"
+        for e in epic_data
+    ))
 
     print("-"*110)
     totals_remaining = sum(e['remaining'] for e in epic_data)
@@ -4,12 +4,13 @@
 import os
 import sys
 from dotenv import load_dotenv
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+# Draw on a bare Figure (rendered by Agg) so pyplot never loads a GUI backend
+from matplotlib.figure import Figure
+import numpy as np
 from datetime import datetime
 
 from jira_client import JiraClient
-from velocity_calculator import VelocityCalculator
+from velocity_calculator import VelocityCalculator, VELOCITY_FIELDS
 
 
 def main():
@@ -34,62 +35,70 @@ def main():
     board_id = int(os.getenv('JIRA_BOARD_ID'))
     project_key = os.getenv('JIRA_PROJECT_KEY', 'project').lower()
 
-    print("Fetching completed sprints (last 6 months)...")
-    # Fetch completed sprints from last 6 months
-    sprints = client.get_board_sprints(board_id)
-    completed_sprints = [
-        s for s in sprints
-        if s.get('state') == 'closed' and s.get('endDate')
-    ]
+    months = int(os.getenv('JIRA_VELOCITY_MONTHS', '6'))
+
+    print(f"Fetching completed sprints (last {months} months)...")
+    # Only closed sprints are requested, so future and active sprints never
+    # cost a page
+    sprints = client.get_board_sprints(board_id, state='closed')
 
-    # Filter to last 6 months
+    # Parse each end date once and keep it on the sprint for the filter and sort
+    completed_sprints = []
+    for s in sprints:
+        if s.get('endDate'):
+            s['_end_dt'] = datetime.fromisoformat(s['endDate'].replace('Z', '+00:00'))
+            completed_sprints.append(s)
+
+    # Filter to the velocity window
     from datetime import timezone, timedelta
-    cutoff_date = datetime.now(timezone.utc) - timedelta(days=6 * 30)
+    cutoff_ts = (datetime.now(timezone.utc) - timedelta(days=months * 30)).timestamp()
     completed_sprints = [
         s for s in completed_sprints
-        if datetime.fromisoformat(s['endDate'].replace('Z', '+00:00')) >= cutoff_date
+        if s['_end_dt'].timestamp() >= cutoff_ts
     ]
 
     if not completed_sprints:
-        print("No completed sprints found in last 6 months.")
+        print(f"No completed sprints found in last {months} months.")
         sys.exit(1)
 
     # Sort chronologically
-    completed_sprints.sort(
-        key=lambda s: datetime.fromisoformat(s['endDate'].replace('Z', '+00:00'))
-    )
+    completed_sprints.sort(key=lambda s: s['_end_dt'])
 
     print(f"Found {len(completed_sprints)} completed sprints")
     print("Calculating velocity for each sprint...")
 
-    velocity_data = []
-    for sprint in completed_sprints:
-        issues = client.get_sprint_issues(sprint['id'])
-        velocity_data.append(velocity_calc.calculate_sprint_velocity(sprint, issues))
+    # Fetch each sprint's issues concurrently
+    sprint_issues = client.get_issues_for_sprints(
+        [s['id'] for s in completed_sprints], closed=True, fields=VELOCITY_FIELDS
+    )
+    velocity_data = [
+        velocity_calc.calculate_sprint_velocity(sprint, sprint_issues[sprint['id']])
+        for sprint in completed_sprints
+    ]
 
     # Extract data for plotting
     sprint_names = [v['sprint_name'] for v in velocity_data]
-    end_dates = [datetime.fromisoformat(v['end_date'].replace('Z', '+00:00')) for v in velocity_data]
-    completed_points = [v['completed_points'] for v in velocity_data]
+    completed_points = np.array([v['completed_points'] for v in velocity_data], dtype=np.float64)
     committed_points = [v['total_points'] for v in velocity_data]
 
-    # Calculate moving average
+    # Calculate moving average from a cumulative sum (the first sprints
+    # average over however many sprints are available)
     window_size = 3
-    moving_avg = []
-    for i in range(len(completed_points)):
-        start_idx = max(0, i - window_size + 1)
-        window = completed_points[start_idx:i + 1]
-        moving_avg.append(sum(window) / len(window))
+    cumulative = np.concatenate(([0.0], np.cumsum(completed_points)))
+    window_end = np.arange(1, len(completed_points) + 1)
+    window_start = np.maximum(0, window_end - window_size)
+    moving_avg = (cumulative[window_end] - cumulative[window_start]) / (window_end - window_start)
 
     # Create the plot
-    fig, ax = plt.subplots(figsize=(14, 8))
+    fig = Figure(figsize=(14, 8), layout='tight')
+    ax = fig.subplots()
 
     # Plot bars for committed and completed
     x_positions = range(len(sprint_names))
     width = 0.35
 
-    bars1 = ax.bar([x - width/2 for x in x_positions], committed_points,
-                    width, label='Committed', color='lightblue', alpha=0.7)
+    ax.bar([x - width/2 for x in x_positions], committed_points,
+           width, label='Committed', color='lightblue', alpha=0.7)
     bars2 = ax.bar([x + width/2 for x in x_positions], completed_points,
                     width, label='Completed', color='darkblue', alpha=0.7)
 
@@ -98,7 +107,7 @@ def main():
             marker='o', label=f'{window_size}-Sprint Moving Average')
 
     # Add mean line
-    mean_velocity = sum(completed_points) / len(completed_points)
+    mean_velocity = completed_points.mean()
     ax.axhline(y=mean_velocity, color='green', linestyle='--',
                linewidth=2, label=f'Average ({mean_velocity:.1f} pts)')
 
@@ -111,38 +120,27 @@ def main():
     ax.legend(loc='upper left', fontsize=10)
     ax.grid(axis='y', alpha=0.3, linestyle='--')
 
-    # Add value labels on bars
-    for bar in bars2:
-        height = bar.get_height()
-        if height > 0:
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.0f}',
-                   ha='center', va='bottom', fontsize=8)
-
-    plt.tight_layout()
+    # Add value labels on bars in one call, leaving empty sprints unlabelled
+    ax.bar_label(bars2, labels=[f'{h:.0f}' if h > 0 else '' for h in completed_points], padding=2, fontsize=8)
 
     # Save to file
     output_file = f'../public/{project_key}_velocity_chart.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    fig.savefig(output_file, dpi=150, bbox_inches='tight')
     print(f"\nChart saved to: {output_file}")
 
     # Print statistics
     print("\n=== Velocity Statistics ===")
     print(f"Total sprints analysed: {len(completed_points)}")
     print(f"Average velocity: {mean_velocity:.1f} points/sprint")
-    print(f"Minimum: {min(completed_points):.1f} points")
-    print(f"Maximum: {max(completed_points):.1f} points")
+    print(f"Minimum: {completed_points.min():.1f} points")
+    print(f"Maximum: {completed_points.max():.1f} points")
     print(f"Latest sprint: {completed_points[-1]:.1f} points")
 
     if len(completed_points) > 1:
-        import statistics
-        std_dev = statistics.stdev(completed_points)
+        std_dev = completed_points.std(ddof=1)
         print(f"Standard deviation: {std_dev:.1f} points")
         print(f"Coefficient of variation: {(std_dev/mean_velocity)*100:.1f}%")
 
-    # Don't show plot interactively - just save to file
-    # plt.show()
-
 
 if __name__ == '__main__':
     main()
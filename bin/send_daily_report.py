@@ -6,29 +6,83 @@ import sys
 from datetime import datetime
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
+import itertools
+import orjson
 
 load_dotenv()
 
 
-def send_email_with_attachment(to_email, pdf_path):
-    """Send email via Resend API with PDF attachment."""
-    resend_api_key = os.getenv('RESEND_API_KEY')
-    if not resend_api_key:
-        print("Error: RESEND_API_KEY not found in environment")
-        sys.exit(1)
+# Stand-in for the attachment content while the rest of the payload is serialised
+ATTACHMENT_PLACEHOLDER = '__ATTACHMENT_CONTENT__'
+
+
+def iter_file_b64(path, chunk_size=57 * 1024):
+    """Yield a file's base64 encoding chunk by chunk without reading it whole.
+
+    chunk_size must be a multiple of 3 so no chunk but the last is padded.
+    """
+    with open(path, 'rb', buffering=1 << 20) as f:
+        while chunk := f.read(chunk_size):
+            yield base64.b64encode(chunk)
+
+
+class AttachmentBody:
+    """File-like JSON request body that base64-encodes the attachment as it is sent.
+
+    The payload is serialised with ATTACHMENT_PLACEHOLDER as the attachment
+    content, and the encoded file is spliced in while requests reads the body,
+    so neither the base64 string nor the full JSON is held in memory. __len__
+    lets requests send a Content-Length rather than a chunked body.
+    """
+
+    def __init__(self, payload, path):
+        head, tail = orjson.dumps(payload).split(ATTACHMENT_PLACEHOLDER.encode())
+        size = os.path.getsize(path)
+        self._length = len(head) + 4 * ((size + 2) // 3) + len(tail)
+        self._parts = itertools.chain([head], iter_file_b64(path), [tail])
+        self._buffer = b''
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        """Return up to size bytes of the body (all remaining if size < 0)."""
+        while size < 0 or len(self._buffer) < size:
+            part = next(self._parts, None)
+            if part is None:
+                break
+            self._buffer += part
+
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def create_session(resend_api_key):
+    """Create a Resend API session that reuses one TLS connection across sends."""
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': f'Bearer {resend_api_key}',
+        'Content-Type': 'application/json',
+    })
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount('https://', adapter)
+    return session
 
-    # Read PDF file and encode as base64
-    with open(pdf_path, 'rb') as f:
-        pdf_content = base64.b64encode(f.read()).decode('utf-8')
 
+def send_email_with_attachment(session, to_email, pdf_path, cc_emails=()):
+    """Send email via Resend API with PDF attachment."""
     project_key = os.path.basename(pdf_path).replace('_', ' ').replace('.pdf', '').upper()
     today = datetime.now().strftime('%Y-%m-%d')
 
-    # Get optional CC list
-    cc_list = os.getenv('EMAIL_CC', '').strip()
-    cc_emails = [email.strip() for email in cc_list.split(',') if email.strip()]
-
     # Simple HTML email body
     html_body = f"""
     <html>
@@ -53,26 +107,20 @@ def send_email_with_attachment(to_email, pdf_path):
         'attachments': [
             {
                 'filename': os.path.basename(pdf_path),
-                'content': pdf_content,
+                'content': ATTACHMENT_PLACEHOLDER,
             }
         ]
     }
 
     # Add CC if configured
     if cc_emails:
-        payload['cc'] = cc_emails
-
-    response = requests.post(
-        'https://api.resend.com/emails',
-        headers={
-            'Authorization': f'Bearer {resend_api_key}',
-            'Content-Type': 'application/json',
-        },
-        json=payload
-    )
+        payload['cc'] = list(cc_emails)
+
+    # Stream the body so the PDF is base64-encoded on the way out
+    response = session.post('https://api.resend.com/emails', data=AttachmentBody(payload, pdf_path))
 
     if response.status_code == 200:
-        result = response.json()
+        result = orjson.loads(response.content)
         print(f"✓ Email sent successfully!")
         print(f"  Message ID: {result.get('id')}")
         print(f"  To: {to_email}")
@@ -91,9 +139,21 @@ def main():
 
     to_email = sys.argv[1]
 
+    resend_api_key = os.getenv('RESEND_API_KEY')
+    if not resend_api_key:
+        print("Error: RESEND_API_KEY not found in environment")
+        sys.exit(1)
+
+    # Get optional CC list (read once for all reports)
+    cc_list = os.getenv('EMAIL_CC', '').strip()
+    cc_emails = [email.strip() for email in cc_list.split(',') if email.strip()]
+
     # Find all PDF reports in public directory
     public_dir = os.path.join(os.path.dirname(__file__), '..', 'public')
-    pdf_files = [f for f in os.listdir(public_dir) if f.endswith('.pdf')]
+    # scandir's entries carry their file type, so no per-file stat is needed;
+    # sorting gives a stable send order
+    with os.scandir(public_dir) as entries:
+        pdf_files = sorted(e.name for e in entries if e.is_file() and e.name.endswith('.pdf'))
 
     if not pdf_files:
         print("Error: No PDF reports found in public/")
@@ -103,11 +163,12 @@ def main():
     print(f"Found {len(pdf_files)} PDF report(s)")
     print()
 
-    for pdf_file in pdf_files:
-        pdf_path = os.path.join(public_dir, pdf_file)
-        print(f"Sending {pdf_file}...")
-        send_email_with_attachment(to_email, pdf_path)
-        print()
+    with create_session(resend_api_key) as session:
+        for pdf_file in pdf_files:
+            pdf_path = os.path.join(public_dir, pdf_file)
+            print(f"Sending {pdf_file}...")
+            send_email_with_attachment(session, to_email, pdf_path, cc_emails)
+            print()
 
 
 if __name__ == '__main__':
@@ -4,12 +4,37 @@
 import csv
 import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+TREND_DATE_FORMAT = '%Y-%m-%d'
+
+# Longer histories are thinned to about this many points in the trend chart
+MAX_TREND_POINTS = 500
+
+
+@lru_cache(maxsize=32)
+def _load_history_df(stats_file, mtime):
+    """Parse a planning history CSV into typed columns.
+
+    mtime is part of the cache key, so a newly logged run invalidates the
+    cached frame for that file.
+    """
+    import pandas as pd
+
+    return pd.read_csv(
+        stats_file,
+        parse_dates=['timestamp'],
+        dtype={'total_points': 'float64', 'total_epics': 'int32', 'completion_date': str}
+    )
+
 
 class StatsLogger:
     """Track changes in planning estimates over time."""
 
+    EPIC_FIELDNAMES = ('timestamp', 'epic_key', 'epic_name', 'remaining_points',
+                       'completed_points', 'total_points', 'progress_pct')
+
     def __init__(self, stats_dir='../stats'):
         """Initialise logger with stats directory."""
         self.stats_dir = Path(stats_dir)
@@ -29,25 +54,19 @@ class StatsLogger:
         # Check if file exists to determine if we need headers
         file_exists = epic_stats_file.exists()
 
-        # Write epic stats
-        with open(epic_stats_file, 'a', newline='') as f:
-            fieldnames = ['timestamp', 'epic_key', 'epic_name', 'remaining_points',
-                         'completed_points', 'total_points', 'progress_pct']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+        # Write epic stats as positional rows in EPIC_FIELDNAMES order, in one
+        # buffered write
+        with open(epic_stats_file, 'a', newline='', buffering=1 << 20) as f:
+            writer = csv.writer(f)
 
             if not file_exists:
-                writer.writeheader()
-
-            for epic in epic_data:
-                writer.writerow({
-                    'timestamp': timestamp,
-                    'epic_key': epic['epic_key'],
-                    'epic_name': epic['epic_name'],
-                    'remaining_points': epic['remaining_points'],
-                    'completed_points': epic['completed_points'],
-                    'total_points': epic['total_points'],
-                    'progress_pct': epic['progress_pct']
-                })
+                writer.writerow(self.EPIC_FIELDNAMES)
+
+            writer.writerows(
+                (timestamp, epic['epic_key'], epic['epic_name'], epic['remaining_points'],
+                 epic['completed_points'], epic['total_points'], epic['progress_pct'])
+                for epic in epic_data
+            )
 
     def get_epic_deltas(self, project_key):
         """Get the change in remaining points for each epic since last run.
@@ -63,36 +82,68 @@ class StatsLogger:
         if not epic_stats_file.exists():
             return {}
 
-        with open(epic_stats_file, 'r') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
+        try:
+            import pandas as pd
+        except ImportError:
+            return self._epic_deltas_from_csv(epic_stats_file)
 
-        if len(rows) < 2:
-            return {}
+        df = pd.read_csv(
+            epic_stats_file,
+            usecols=['timestamp', 'epic_key', 'remaining_points'],
+            dtype={'timestamp': str, 'epic_key': str, 'remaining_points': float}
+        )
 
-        # Get unique timestamps (sorted)
-        timestamps = sorted(set(r['timestamp'] for r in rows))
+        # Get the two most recent runs (ISO timestamps sort chronologically)
+        timestamps = df['timestamp'].drop_duplicates().sort_values()
         if len(timestamps) < 2:
             return {}
 
-        latest = timestamps[-1]
-        previous = timestamps[-2]
+        latest, previous = (
+            df[df['timestamp'] == ts].drop_duplicates('epic_key', keep='last')
+            .set_index('epic_key')['remaining_points']
+            for ts in (timestamps.iloc[-1], timestamps.iloc[-2])
+        )
 
-        # Build maps of epic_key -> remaining_points for each timestamp
-        latest_epics = {r['epic_key']: float(r['remaining_points'])
-                       for r in rows if r['timestamp'] == latest}
-        previous_epics = {r['epic_key']: float(r['remaining_points'])
-                         for r in rows if r['timestamp'] == previous}
+        # Subtraction aligns on epic key; epics new in the latest run have
+        # no previous value and are dropped
+        return (latest - previous).dropna().to_dict()
 
-        # Calculate deltas
-        deltas = {}
-        for epic_key, current_remaining in latest_epics.items():
-            if epic_key in previous_epics:
-                delta = current_remaining - previous_epics[epic_key]
-                deltas[epic_key] = delta
-            # If epic is new, no delta
+    def _epic_deltas_from_csv(self, epic_stats_file):
+        """Stdlib fallback for get_epic_deltas when pandas is unavailable.
 
-        return deltas
+        Reads rows positionally with csv.reader and keeps only the epics of
+        the two most recent runs while scanning.
+        """
+        with open(epic_stats_file, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return {}
+            ts_i = header.index('timestamp')
+            key_i = header.index('epic_key')
+            rem_i = header.index('remaining_points')
+
+            latest = previous = None
+            latest_epics = {}
+            previous_epics = {}
+            for row in reader:
+                ts = row[ts_i]
+                if latest is None or ts > latest:
+                    previous, previous_epics = latest, latest_epics
+                    latest, latest_epics = ts, {}
+                elif ts != latest and (previous is None or ts > previous):
+                    previous, previous_epics = ts, {}
+                if ts == latest:
+                    latest_epics[row[key_i]] = float(row[rem_i])
+                elif ts == previous:
+                    previous_epics[row[key_i]] = float(row[rem_i])
+
+        # Epics new in the latest run have no delta
+        return {
+            epic_key: remaining - previous_epics[epic_key]
+            for epic_key, remaining in latest_epics.items()
+            if epic_key in previous_epics
+        }
 
     def log_planning_stats(self, project_key, epic_timeline, velocity_stats, team_size, target_velocity=None):
         """Log current planning statistics to CSV file.
@@ -151,11 +202,11 @@ class StatsLogger:
         file_exists = stats_file.exists()
 
         # Append to CSV
-        with open(stats_file, 'a', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=record.keys())
+        with open(stats_file, 'a', newline='', buffering=1 << 20) as f:
+            writer = csv.writer(f)
             if not file_exists:
-                writer.writeheader()
-            writer.writerow(record)
+                writer.writerow(record.keys())
+            writer.writerow(record.values())
 
         print(f"✓ Stats logged: {stats_file}")
 
@@ -176,27 +227,62 @@ class StatsLogger:
             reader = csv.DictReader(f)
             return list(reader)
 
+    def get_trend_inputs(self, project_key):
+        """Return the values the trend chart plots, up to their last change.
+
+        Runs that repeat the previous run's total points, epic count and
+        completion date are dropped, so the result only changes when a
+        plotted value does.
+
+        Returns:
+            List of [timestamp, total_points, total_epics, completion_date] rows
+        """
+        rows = []
+        for record in self.get_history(project_key):
+            values = [record['total_points'], record['total_epics'], record['completion_date']]
+            if not rows or rows[-1][1:] != values:
+                rows.append([record['timestamp'], *values])
+        return rows
+
+    def get_history_df(self, project_key):
+        """Read historical stats for a project as a DataFrame.
+
+        Returns:
+            DataFrame of stats records, or None if there is no history
+        """
+        stats_file = self.stats_dir / f"{project_key}_history.csv"
+
+        if not stats_file.exists():
+            return None
+
+        return _load_history_df(str(stats_file), os.path.getmtime(stats_file))
+
     def generate_trend_chart(self, project_key):
         """Generate visualization of planning trends over time.
 
         Creates a chart showing how estimates have changed.
         """
-        history = self.get_history(project_key)
+        history = self.get_history_df(project_key)
 
-        if len(history) < 2:
+        if history is None or len(history) < 2:
             print(f"Not enough history to generate trend chart (need at least 2 data points)")
             return None
 
         import matplotlib
         matplotlib.use('Agg')
         import matplotlib.pyplot as plt
-        from datetime import datetime as dt
+        import matplotlib.dates as mdates
+        import pandas as pd
+
+        # Thin very long histories, always keeping the latest run
+        step = (len(history) + MAX_TREND_POINTS - 1) // MAX_TREND_POINTS
+        if step > 1:
+            history = pd.concat([history.iloc[:-1:step], history.iloc[-1:]])
 
-        # Parse data
-        dates = [dt.fromisoformat(r['timestamp']) for r in history]
-        total_points = [float(r['total_points']) for r in history]
-        total_epics = [int(r['total_epics']) for r in history]
-        completion_dates = [r['completion_date'] for r in history]
+        # Columns are already typed, so pass the arrays straight to matplotlib
+        dates = history['timestamp'].to_numpy()
+        total_points = history['total_points'].to_numpy()
+        total_epics = history['total_epics'].to_numpy()
 
         # Create figure with subplots
         fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10))
@@ -214,39 +300,35 @@ class StatsLogger:
         ax2.grid(True, alpha=0.3)
 
         # Plot 3: Projected completion date over time
-        # Convert completion dates to datetime for plotting
-        completion_dts = []
-        plot_dates = []
-        for i, comp_date in enumerate(completion_dates):
-            if comp_date != 'N/A':
-                try:
-                    completion_dts.append(dt.strptime(comp_date, '%Y-%m-%d'))
-                    plot_dates.append(dates[i])
-                except ValueError:
-                    pass
-
-        if completion_dts:
+        # Convert completion dates to datetime for plotting ('N/A' and
+        # malformed dates become NaT and are skipped)
+        completion = pd.to_datetime(history['completion_date'], format=TREND_DATE_FORMAT, errors='coerce')
+        has_completion = completion.notna().to_numpy()
+        completion_dts = completion.to_numpy()[has_completion]
+        plot_dates = dates[has_completion]
+
+        if len(completion_dts):
             ax3.plot(plot_dates, completion_dts, marker='d', linewidth=2, markersize=6, color='#5fa321')
             ax3.set_ylabel('Projected Completion', fontsize=11, fontweight='bold')
             ax3.set_xlabel('Measurement Date', fontsize=11, fontweight='bold')
             ax3.grid(True, alpha=0.3)
 
             # Format y-axis as dates
-            import matplotlib.dates as mdates
-            ax3.yaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+            ax3.yaxis.set_major_formatter(mdates.DateFormatter(TREND_DATE_FORMAT))
             plt.setp(ax3.yaxis.get_majorticklabels(), rotation=45, ha='right')
 
         # Format x-axis for all plots
         for ax in [ax1, ax2, ax3]:
-            ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%Y-%m-%d'))
+            # Formatters bind to their axis, so each axis needs its own instance
+            ax.xaxis.set_major_formatter(mdates.DateFormatter(TREND_DATE_FORMAT))
             plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
 
         plt.tight_layout()
 
         # Save chart
         output_file = f'../public/{project_key}_trends.png'
-        fig.savefig(output_file, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(output_file, dpi=150, bbox_inches='tight')
+        plt.close(fig)
 
         print(f"✓ Trend chart saved: {output_file}")
 
@@ -1,8 +1,24 @@
 """Calculate team velocity and capacity from historical sprint data."""
 
 from datetime import datetime, timedelta, timezone
-from typing import Any
-import statistics
+import heapq
+from operator import itemgetter
+from typing import Any, Iterator
+import time
+import numpy as np
+
+# Velocity only needs completion status and story points from sprint issues
+VELOCITY_FIELDS = 'status,customfield_10016,customfield_10026,customfield_10031'
+
+# How long get_historical_velocity results are reused within a process (seconds)
+HISTORY_TTL = 300
+
+# Shared by every calculator in the process, since the report scripts build a
+# new one per project and output. Closed sprints never change, so their
+# velocity is kept for the process lifetime, keyed by (Jira URL, sprint ID);
+# whole history lookups, keyed by Jira URL and arguments, expire after HISTORY_TTL
+_sprint_velocity_cache: dict[tuple[str, int], dict[str, Any]] = {}
+_history_cache: dict[tuple, tuple[float, list[dict[str, Any]]]] = {}
 
 
 class VelocityCalculator:
@@ -11,16 +27,24 @@ class VelocityCalculator:
     def __init__(self, jira_client):
         self.client = jira_client
 
-    def calculate_sprint_velocity(self, sprint: dict[str, Any], issues: list[dict[str, Any]]) -> dict[str, Any]:
-        """Calculate velocity metrics for a single sprint."""
-        total_points = 0.0
-        completed_points = 0.0
+    def calculate_sprint_velocity(
+        self,
+        sprint: dict[str, Any],
+        issues: list[dict[str, Any]],
+        end_dt: datetime | None = None
+    ) -> dict[str, Any]:
+        """Calculate velocity metrics for a single sprint.
+
+        end_dt is the sprint's already-parsed end date, if the caller has it.
+        """
+        # Look up each issue's points once, with the client methods bound locally
+        get_points = self.client.get_story_points
+        is_completed = self.client.is_issue_completed
 
-        for issue in issues:
-            points = self.client.get_story_points(issue)
-            total_points += points
-            if self.client.is_issue_completed(issue):
-                completed_points += points
+        # Completion is a bool, so multiplying masks out unfinished issues
+        points = [get_points(issue) for issue in issues]
+        total_points = sum(points, 0.0)
+        completed_points = sum((p * is_completed(issue) for p, issue in zip(points, issues)), 0.0)
 
         return {
             'sprint_name': sprint.get('name', 'Unknown'),
@@ -28,72 +52,142 @@ class VelocityCalculator:
             'state': sprint.get('state', 'unknown'),
             'start_date': sprint.get('startDate'),
             'end_date': sprint.get('endDate'),
+            'end_date_dt': end_dt,
             'total_points': total_points,
             'completed_points': completed_points,
-            'completion_rate': completed_points / total_points if total_points > 0 else 0.0
+            'completion_rate': completed_points / total_points if total_points else 0.0
         }
 
-    def get_historical_velocity(self, board_id: int, num_sprints: int = 6, months: int = None) -> list[dict[str, Any]]:
-        """Get velocity data for the last N completed sprints or last M months.
-
-        Args:
-            board_id: Jira board ID
-            num_sprints: Number of sprints to fetch (ignored if months is set)
-            months: If set, fetch sprints from last N months instead of using num_sprints
+    def _select_sprints(
+        self,
+        board_id: int,
+        num_sprints: int,
+        months: int | None,
+        force_refresh: bool = False
+    ) -> list[tuple[datetime, dict[str, Any]]]:
+        """Return (end date, sprint) pairs for the requested closed sprints, newest first.
+
+        force_refresh skips the HTTP cache.
         """
-        sprints = self.client.get_board_sprints(board_id)
+        sprints = self.client.get_board_sprints(board_id, force_refresh=force_refresh)
 
-        # Filter to completed sprints only and sort by end date
-        completed_sprints = [
-            s for s in sprints
+        # Filter to completed sprints only, parsing each end date once
+        dated_sprints = [
+            (datetime.fromisoformat(s['endDate'].replace('Z', '+00:00')), s)
+            for s in sprints
             if s.get('state') == 'closed' and s.get('endDate')
         ]
-        completed_sprints.sort(
-            key=lambda s: datetime.fromisoformat(s['endDate'].replace('Z', '+00:00')),
-            reverse=True
-        )
 
         # Filter by date if months specified
         if months is not None:
-            from datetime import timedelta
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=months * 30)
-            completed_sprints = [
-                s for s in completed_sprints
-                if datetime.fromisoformat(s['endDate'].replace('Z', '+00:00')) >= cutoff_date
-            ]
-        else:
-            # Use num_sprints limit
-            completed_sprints = completed_sprints[:num_sprints]
+            dated_sprints = [t for t in dated_sprints if t[0] >= cutoff_date]
+            dated_sprints.sort(key=itemgetter(0), reverse=True)
+            return dated_sprints
 
-        velocity_data = []
-        for sprint in completed_sprints:
-            issues = self.client.get_sprint_issues(sprint['id'])
-            velocity_data.append(self.calculate_sprint_velocity(sprint, issues))
+        # Use num_sprints limit; select the newest rather than sorting them all
+        return heapq.nlargest(num_sprints, dated_sprints, key=itemgetter(0))
+
+    def _iter_sprint_velocity(
+        self,
+        dated_sprints: list[tuple[datetime, dict[str, Any]]],
+        bypass_cache: bool = False
+    ) -> Iterator[dict[str, Any]]:
+        """Yield velocity for each sprint, cached ones first, then as fetches finish.
+
+        bypass_cache refetches every sprint from Jira, skipping the HTTP cache too.
+        """
+        url = self.client.url
+        to_fetch = []
+        for end_dt, sprint in dated_sprints:
+            if bypass_cache or (url, sprint['id']) not in _sprint_velocity_cache:
+                to_fetch.append((end_dt, sprint))
+            else:
+                yield _sprint_velocity_cache[url, sprint['id']]
+
+        if not to_fetch:
+            return
+
+        # Fetch the issues of sprints not seen before concurrently
+        dated_by_id = {sprint['id']: (end_dt, sprint) for end_dt, sprint in to_fetch}
+        for sprint_id, issues in self.client.iter_issues_for_sprints(
+            list(dated_by_id), closed=True, fields=VELOCITY_FIELDS, force_refresh=bypass_cache
+        ):
+            end_dt, sprint = dated_by_id[sprint_id]
+            velocity = self.calculate_sprint_velocity(sprint, issues, end_dt)
+            _sprint_velocity_cache[url, sprint_id] = velocity
+            yield velocity
+
+    def iter_historical_velocity(
+        self,
+        board_id: int,
+        num_sprints: int = 6,
+        months: int = None,
+        bypass_cache: bool = False
+    ) -> Iterator[dict[str, Any]]:
+        """Yield velocity data for the selected sprints as soon as each is ready.
+
+        Takes the same arguments as get_historical_velocity, but records come
+        in completion order rather than date order.
+        """
+        dated_sprints = self._select_sprints(board_id, num_sprints, months, force_refresh=bypass_cache)
+        yield from self._iter_sprint_velocity(dated_sprints, bypass_cache)
+
+    def get_historical_velocity(
+        self,
+        board_id: int,
+        num_sprints: int = 6,
+        months: int = None,
+        bypass_cache: bool = False,
+        skip_empty: bool = False
+    ) -> list[dict[str, Any]]:
+        """Get velocity data for the last N completed sprints or last M months.
+
+        Args:
+            board_id: Jira board ID
+            num_sprints: Number of sprints to fetch (ignored if months is set)
+            months: If set, fetch sprints from last N months instead of using num_sprints
+            bypass_cache: Refetch from Jira, skipping both the in-process and HTTP caches
+            skip_empty: Drop sprints with no committed points (e.g. spike sprints)
+        """
+        key = (self.client.url, board_id, num_sprints, months, skip_empty)
+        cached = _history_cache.get(key)
+        if cached and not bypass_cache and time.monotonic() - cached[0] < HISTORY_TTL:
+            return list(cached[1])
+
+        dated_sprints = self._select_sprints(board_id, num_sprints, months, force_refresh=bypass_cache)
+        by_id = {v['sprint_id']: v for v in self._iter_sprint_velocity(dated_sprints, bypass_cache)}
 
         # Return in chronological order
-        return list(reversed(velocity_data))
+        velocity_data = [by_id[s['id']] for _, s in reversed(dated_sprints)]
+        if skip_empty:
+            velocity_data = [v for v in velocity_data if v['total_points']]
+        _history_cache[key] = (time.monotonic(), velocity_data)
+        return list(velocity_data)
 
     def calculate_average_velocity(self, velocity_data: list[dict[str, Any]]) -> float:
         """Calculate average completed points across sprints."""
         if not velocity_data:
             return 0.0
 
-        completed_points = [v['completed_points'] for v in velocity_data]
-        return statistics.mean(completed_points)
+        return sum(v['completed_points'] for v in velocity_data) / len(velocity_data)
 
     def calculate_velocity_stats(self, velocity_data: list[dict[str, Any]]) -> dict[str, float]:
         """Calculate statistical metrics for velocity."""
         if not velocity_data:
             return {'mean': 0.0, 'median': 0.0, 'std_dev': 0.0, 'min': 0.0, 'max': 0.0}
 
-        completed_points = [v['completed_points'] for v in velocity_data]
+        # Reduce over a float array; stdev uses the sample (n - 1) form
+        points = np.fromiter(
+            (v['completed_points'] for v in velocity_data), dtype=np.float64, count=len(velocity_data)
+        )
 
         return {
-            'mean': statistics.mean(completed_points),
-            'median': statistics.median(completed_points),
-            'std_dev': statistics.stdev(completed_points) if len(completed_points) > 1 else 0.0,
-            'min': min(completed_points),
-            'max': max(completed_points)
+            'mean': float(points.mean()),
+            'median': float(np.median(points)),
+            'std_dev': float(points.std(ddof=1)) if len(points) > 1 else 0.0,
+            'min': float(points.min()),
+            'max': float(points.max())
         }
 
     def project_sprint_capacity(
@@ -103,29 +197,30 @@ class VelocityCalculator:
         confidence_factor: float = 0.8
     ) -> list[dict[str, Any]]:
         """Project future sprint capacity based on historical velocity."""
-        avg_velocity = self.calculate_average_velocity(velocity_data)
+        avg_velocity = self.calculate_velocity_stats(velocity_data)['mean']
         conservative_velocity = avg_velocity * confidence_factor
 
         if not velocity_data:
             last_sprint_end = datetime.now()
         else:
-            last_sprint_end = datetime.fromisoformat(
+            # Reuse the end date parsed when the history was fetched
+            last_sprint_end = velocity_data[-1].get('end_date_dt') or datetime.fromisoformat(
                 velocity_data[-1]['end_date'].replace('Z', '+00:00')
             )
 
-        projections = []
-        for i in range(1, num_future_sprints + 1):
-            sprint_start = last_sprint_end + timedelta(days=1)
-            sprint_end = sprint_start + timedelta(weeks=1)  # 1-week sprints
-
-            projections.append({
-                'sprint_number': i,
-                'start_date': sprint_start.isoformat(),
-                'end_date': sprint_end.isoformat(),
+        # Each 1-week sprint starts the day after the previous one ends, so
+        # sprint i starts (i - 1) * 8 days after the first
+        first_start = last_sprint_end + timedelta(days=1)
+        sprint_step = timedelta(days=8)
+        sprint_length = timedelta(weeks=1)
+
+        return [
+            {
+                'sprint_number': i + 1,
+                'start_date': (first_start + i * sprint_step).isoformat(),
+                'end_date': (first_start + i * sprint_step + sprint_length).isoformat(),
                 'projected_capacity': conservative_velocity,
                 'optimistic_capacity': avg_velocity
-            })
-
-            last_sprint_end = sprint_end
-
-        return projections
+            }
+            for i in range(num_future_sprints)
+        ]
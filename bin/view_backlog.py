@@ -1,34 +1,42 @@
 #!/usr/bin/env python3
 """View top issues from the backlog by story points."""
 
+import heapq
 import os
 import sys
+from operator import itemgetter
 from dotenv import load_dotenv
-import requests
+import orjson
 from jira_client import JiraClient
 from velocity_calculator import VelocityCalculator
 
 load_dotenv()
 
+# Backlog sort order: Highest -> High -> Medium -> Low -> Minor -> Trivial -> None
+PRIORITY_ORDER = {
+    'Highest': 0,
+    'High': 1,
+    'Medium': 2,
+    'Low': 3,
+    'Minor': 4,
+    'Trivial': 5,
+    'None': 6
+}
 
-def get_backlog_top_issues(board_id, limit_points=None, limit_count=None):
+
+def get_backlog_top_issues(client, board_id, limit_points=None, limit_count=None):
     """Get top issues from backlog, limited by story points or count.
 
     Args:
+        client: JiraClient to fetch with
         board_id: Jira board ID
         limit_points: Maximum total story points to fetch (optional)
         limit_count: Maximum number of issues to fetch (optional)
     """
-    url = os.getenv('JIRA_URL').rstrip('/')
-    auth = (os.getenv('JIRA_EMAIL'), os.getenv('JIRA_API_TOKEN'))
-    headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
-
     # Get backlog issues (not in active sprint)
     # Jira orders backlog by rank, so we get them in priority order
-    response = requests.get(
-        f'{url}/rest/agile/1.0/board/{board_id}/backlog',
-        auth=auth,
-        headers=headers,
+    response = client.session.get(
+        f'{client.url}/rest/agile/1.0/board/{board_id}/backlog',
         params={
             'maxResults': 100,
             'fields': 'summary,status,assignee,customfield_10016,customfield_10026,customfield_10031,priority,labels'
@@ -40,7 +48,7 @@ def get_backlog_top_issues(board_id, limit_points=None, limit_count=None):
         print(f"Response: {response.text}")
         return []
 
-    issues = response.json().get('issues', [])
+    issues = orjson.loads(response.content).get('issues', [])
 
     if not issues:
         print("No issues found in backlog")
@@ -50,39 +58,34 @@ def get_backlog_top_issues(board_id, limit_points=None, limit_count=None):
     backlog_items = []
 
     for issue in issues:
-        # Try all common story point fields
-        points = (issue['fields'].get('customfield_10016') or
-                 issue['fields'].get('customfield_10026') or
-                 issue['fields'].get('customfield_10031'))
-        points = float(points) if points else 0.0
-
-        status = issue['fields'].get('status', {}).get('name', 'Unknown')
-        assignee = issue['fields'].get('assignee')
+        fields = issue['fields']
+
+        points = client.get_story_points(issue)
+
+        status = fields.get('status', {}).get('name', 'Unknown')
+        assignee = fields.get('assignee')
         assignee_name = assignee.get('displayName', 'Unassigned') if assignee else 'Unassigned'
-        priority = issue['fields'].get('priority', {}).get('name', 'None')
-        labels = issue['fields'].get('labels', [])
+        priority = fields.get('priority', {}).get('name', 'None')
+        labels = fields.get('labels', [])
 
         backlog_items.append({
             'key': issue['key'],
-            'summary': issue['fields'].get('summary', 'No summary'),
+            'summary': fields.get('summary', 'No summary'),
             'points': points,
             'status': status,
             'assignee': assignee_name,
             'priority': priority,
-            'labels': labels
+            'labels': labels,
+            '_prio_rank': PRIORITY_ORDER.get(priority, 999)
         })
 
-    # Sort by priority: Highest -> High -> Medium -> Low -> Minor -> Trivial -> None
-    priority_order = {
-        'Highest': 0,
-        'High': 1,
-        'Medium': 2,
-        'Low': 3,
-        'Minor': 4,
-        'Trivial': 5,
-        'None': 6
-    }
-    backlog_items.sort(key=lambda x: priority_order.get(x['priority'], 999))
+    # Sort by the priority rank computed above (stable, so rank order is kept
+    # within a priority). With a count limit only the first limit_count items
+    # can be shown, so select those rather than sorting the whole backlog
+    if limit_count:
+        backlog_items = heapq.nsmallest(limit_count, backlog_items, key=itemgetter('_prio_rank'))
+    else:
+        backlog_items.sort(key=itemgetter('_prio_rank'))
 
     # Now apply limits after sorting
     filtered_items = []
@@ -141,6 +144,8 @@ def main():
         print("  --points <N>    Show issues up to N story points (e.g., --points 20)")
         print("  --count <N>     Show N issues (e.g., --count 10)")
         print("  --details       Show additional details (priority, labels)")
+        print("  --show-actual   With a target velocity set, also calculate actual velocity")
+        print("  --no-cache      Discard cached Jira responses and fetch fresh data")
         print("\nDefault behaviour (no options):")
         print("  Uses average velocity from recent sprints as the point limit")
         print("  Perfect for sprint planning based on historical capacity")
@@ -156,6 +161,8 @@ def main():
     limit_points = None
     limit_count = None
     show_details = False
+    show_actual = False
+    no_cache = False
 
     i = 2
     while i < len(sys.argv):
@@ -168,29 +175,41 @@ def main():
         elif sys.argv[i] == '--details':
             show_details = True
             i += 1
+        elif sys.argv[i] == '--show-actual':
+            show_actual = True
+            i += 1
+        elif sys.argv[i] == '--no-cache':
+            no_cache = True
+            i += 1
         else:
             print(f"Unknown option: {sys.argv[i]}")
             sys.exit(1)
 
-    # Validate credentials
-    if not all([os.getenv('JIRA_URL'), os.getenv('JIRA_EMAIL'), os.getenv('JIRA_API_TOKEN')]):
+    # Validate credentials once and share one client for velocity and backlog
+    jira_url = os.getenv('JIRA_URL')
+    jira_email = os.getenv('JIRA_EMAIL')
+    jira_api_token = os.getenv('JIRA_API_TOKEN')
+    if not all([jira_url, jira_email, jira_api_token]):
         print("Error: Missing Jira credentials in .env file")
         sys.exit(1)
 
+    client = JiraClient(jira_url, jira_email, jira_api_token)
+    if no_cache:
+        client.clear_cache()
+
     # If no limit specified, use velocity override or calculate average velocity
     if limit_points is None and limit_count is None:
         velocity_override = os.getenv('TARGET_VELOCITY') or os.getenv('VELOCITY_OVERRIDE')  # Support old name for compatibility
 
-        if velocity_override:
+        if velocity_override and not show_actual:
+            # The target is the limit, so skip the sprint history fetch
+            limit_points = float(velocity_override)
+            print(f"📊 Using target velocity: {limit_points:.1f} story points")
+        elif velocity_override:
             limit_points = float(velocity_override)
 
             # Calculate actual velocity to show in brackets
             print(f"📊 Calculating average velocity for board {board_id}...")
-            client = JiraClient(
-                os.getenv('JIRA_URL'),
-                os.getenv('JIRA_EMAIL'),
-                os.getenv('JIRA_API_TOKEN')
-            )
             calc = VelocityCalculator(client)
             velocity_data = calc.get_historical_velocity(board_id, months=6)
 
@@ -203,11 +222,6 @@ def main():
                 print(f"📊 Using target velocity: {limit_points:.1f} story points")
         else:
             print(f"📊 Calculating average velocity for board {board_id}...")
-            client = JiraClient(
-                os.getenv('JIRA_URL'),
-                os.getenv('JIRA_EMAIL'),
-                os.getenv('JIRA_API_TOKEN')
-            )
             calc = VelocityCalculator(client)
             velocity_data = calc.get_historical_velocity(board_id, months=6)
 
@@ -224,7 +238,7 @@ def main():
     if limit_count:
         print(f"   Limit: {limit_count} issues")
 
-    items = get_backlog_top_issues(board_id, limit_points, limit_count)
+    items = get_backlog_top_issues(client, board_id, limit_points, limit_count)
 
     if items:
         print_backlog_items(items, show_details)